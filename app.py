@@ -1,9 +1,22 @@
+import functools
+import os
+import uuid
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import plotly.express as px
-import plotly.graph_objects as go
-import random
+
+from kpi import charts
+from kpi.cache import FigureCache, LRUCache
+from kpi.export import EXPORT_FORMATS, export_bytes, export_file_name
+from kpi.history import HistorySource, history_from_env
+from kpi.pipeline import apply_filters, default_filters, prewarm_figures, project_view, top_employees, trend_view
+from kpi.profiling import Profiler, latency_percentiles, profiling_requested, waterfall_figure
+from kpi.refresh import Refresher, format_age
+from kpi.ranking import RANK_METRICS
+from kpi.sections import DEFAULT_INPUTS, filter_inputs, section_key
+from kpi.sources import open_source, source_from_env
+from kpi.store import store_from_env
+from kpi.table import PAGE_SIZES, SHOW_COLS, page_count, table_page
+from kpi.weights import DEFAULT_WEIGHTS, SCORE_COLUMNS, weight_key
 
 st.set_page_config(
     page_title="Employee Performance KPI",
@@ -68,441 +81,409 @@ div[data-baseweb="select"] { background-color: #1e2235 !important; }
 
 
 # ─────────────────────────────────────────────
-#  DATA GENERATION — 100 employees, project-based
+#  PROFILING — ?profile=1 or KPI_PROFILE=1; KPI_PROFILE_LOG=<path.jsonl> appends every rerun
 # ─────────────────────────────────────────────
-@st.cache_data
-def generate_data():
-    random.seed(99)
-    np.random.seed(99)
-
-    departments = ["Engineering", "Marketing", "Sales", "HR", "Product", "Finance", "Operations", "Design"]
-    roles       = ["Director", "Senior Manager", "Manager", "Senior", "Mid-Level", "Junior", "Intern"]
-    projects    = [
-        "Project Alpha", "Project Beta", "Project Gamma", "Project Delta",
-        "Project Epsilon", "Project Zeta", "Project Eta", "Project Theta",
-        "Project Iota", "Project Kappa"
-    ]
-
-    first_names = ["Aarav","Priya","Rohit","Sneha","Vikram","Anjali","Amit","Pooja","Rahul","Deepa",
-                   "Karan","Nisha","Suresh","Kavya","Arjun","Meera","Nikhil","Riya","Sanjay","Divya",
-                   "Aditya","Shruti","Manish","Swati","Rajesh","Komal","Varun","Neha","Sachin","Prachi",
-                   "Dev","Ananya","Kunal","Simran","Tarun","Isha","Vivek","Tanya","Ashish","Pallavi",
-                   "Naveen","Garima","Harsh","Ritika","Sumit","Preeti","Gaurav","Sonal","Akash","Jyoti",
-                   "James","Emma","Oliver","Sophia","Liam","Ava","Noah","Isabella","William","Mia",
-                   "Benjamin","Charlotte","Lucas","Amelia","Mason","Harper","Ethan","Evelyn","Alexander","Abigail",
-                   "Henry","Emily","Sebastian","Elizabeth","Jacob","Sofia","Michael","Avery","Daniel","Ella",
-                   "Logan","Scarlett","Jackson","Grace","Aiden","Chloe","Samuel","Victoria","David","Riley",
-                   "Muhammad","Fatima","Omar","Layla","Hassan","Yasmin","Ali","Nour","Khalid","Sara"]
-
-    last_names  = ["Sharma","Patel","Gupta","Singh","Kumar","Verma","Joshi","Shah","Mehta","Nair",
-                   "Smith","Johnson","Williams","Brown","Jones","Garcia","Miller","Davis","Wilson","Anderson",
-                   "Taylor","Thomas","Jackson","White","Harris","Martin","Thompson","Moore","Young","Allen",
-                   "Khan","Ahmed","Ali","Hassan","Hussain","Malik","Qureshi","Chaudhry","Iqbal","Sheikh",
-                   "Park","Kim","Lee","Choi","Jung","Yoon","Lim","Han","Oh","Seo",
-                   "Chen","Wang","Li","Liu","Zhang","Huang","Zhao","Wu","Zhou","Sun",
-                   "Tanaka","Yamamoto","Suzuki","Watanabe","Ito","Sato","Kobayashi","Kato","Abe","Nakamura",
-                   "Silva","Santos","Oliveira","Souza","Costa","Alves","Carvalho","Gomes","Martins","Rocha",
-                   "Lopez","Martinez","Rodriguez","Hernandez","Gonzalez","Perez","Sanchez","Ramirez","Torres","Flores",
-                   "Muller","Schmidt","Schneider","Fischer","Weber","Meyer","Wagner","Becker","Schulz","Hoffmann"]
-
-    records = []
-    for i in range(100):
-        dept      = departments[i % len(departments)]
-        role      = random.choice(roles)
-        project   = random.choice(projects)
-        proj2     = random.choice([p for p in projects if p != project]) if random.random() > 0.5 else None
-
-        tasks_assigned  = int(np.random.randint(15, 80))
-        tasks_completed = int(tasks_assigned * np.random.uniform(0.55, 1.0))
-        tasks_overdue   = int(np.random.randint(0, max(1, tasks_assigned - tasks_completed + 1)))
-
-        quality    = round(float(np.random.uniform(50, 100)), 1)
-        ontime     = round(float(np.random.uniform(45, 100)), 1)
-        collab     = round(float(np.random.uniform(50, 100)), 1)
-        initiative = round(float(np.random.uniform(50, 100)), 1)
-        prod_score = round(float(np.random.uniform(50, 100)), 1)
-
-        name = f"{first_names[i]} {last_names[i]}"
-
-        records.append({
-            "ID":               f"EMP{1000+i+1}",
-            "Name":             name,
-            "Department":       dept,
-            "Role":             role,
-            "Primary_Project":  project,
-            "Secondary_Project": proj2 if proj2 else "—",
-            "Tasks_Assigned":   tasks_assigned,
-            "Tasks_Completed":  tasks_completed,
-            "Tasks_Overdue":    tasks_overdue,
-            "Quality_Score":    quality,
-            "On_Time_Rate":     ontime,
-            "Collaboration":    collab,
-            "Initiative":       initiative,
-            "Productivity":     prod_score,
-        })
-
-    df = pd.DataFrame(records)
-    df["Completion_Rate"] = (df["Tasks_Completed"] / df["Tasks_Assigned"] * 100).round(1)
-    df["Overall_KPI"] = (
-        df["Productivity"]      * 0.25 +
-        df["Completion_Rate"]   * 0.25 +
-        df["On_Time_Rate"]      * 0.20 +
-        df["Quality_Score"]     * 0.20 +
-        df["Collaboration"]     * 0.10
-    ).round(1)
-
-    def assign_level(s):
-        if s >= 88:  return "🏆 Outstanding"
-        elif s >= 78: return "⭐ Excellent"
-        elif s >= 68: return "✅ Good"
-        elif s >= 55: return "⚠️ Needs Improvement"
-        else:         return "🔴 Critical"
-
-    df["Performance_Level"] = df["Overall_KPI"].apply(assign_level)
-
-    # Monthly trend per dept
-    months = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
-    trend_rows = []
-    for dept in departments:
-        score = int(np.random.randint(65, 82))
-        for m in months:
-            score = max(50, min(100, score + int(np.random.randint(-5, 7))))
-            trend_rows.append({"Month": m, "Department": dept, "KPI_Score": score})
-
-    # Project summary
-    proj_rows = []
-    for proj in projects:
-        proj_df = df[df["Primary_Project"] == proj]
-        if len(proj_df) == 0:
-            continue
-        proj_rows.append({
-            "Project": proj,
-            "Team_Size": len(proj_df),
-            "Avg_KPI": round(proj_df["Overall_KPI"].mean(), 1),
-            "Avg_Completion": round(proj_df["Completion_Rate"].mean(), 1),
-            "Avg_Quality": round(proj_df["Quality_Score"].mean(), 1),
-            "Total_Tasks": proj_df["Tasks_Assigned"].sum(),
-            "Completed_Tasks": proj_df["Tasks_Completed"].sum(),
-            "Overdue_Tasks": proj_df["Tasks_Overdue"].sum(),
-        })
-
-    return df, pd.DataFrame(trend_rows), pd.DataFrame(proj_rows)
-
-
-df, trend_df, proj_df = generate_data()
-
-PERF_COLORS_MAP = {
-    "🏆 Outstanding":      "#a78bfa",
-    "⭐ Excellent":        "#34d399",
-    "✅ Good":             "#60a5fa",
-    "⚠️ Needs Improvement": "#fbbf24",
-    "🔴 Critical":         "#f87171",
-}
-DEPT_COLORS = px.colors.qualitative.Bold
+profiler = Profiler(
+    enabled=profiling_requested(st.query_params.get("profile")),
+    log_path=os.environ.get("KPI_PROFILE_LOG"),
+    session_id=st.session_state.setdefault("profile_session", uuid.uuid4().hex[:12]),
+)
+
+
+def show_chart(chart_id, inputs, build, *args, **kwargs):
+    # Shared by every session; rebuilt only when an input the chart declares
+    # in kpi.sections has changed
+    key = (DATASET_KEY, POINT_THRESHOLD) + section_key(chart_id, inputs)
+    entry = get_figure_cache().get(key)
+    if entry is None:
+        with profiler.stage(f"{chart_id} · build"):
+            entry = get_figure_cache().put(key, build(*args, **kwargs))
+    fig, nbytes = entry
+    with profiler.stage(f"{chart_id} · render"):
+        st.plotly_chart(fig, width="stretch")
+    profiler.payload(chart_id, nbytes)
+    return fig
+
+
+def fragment_section(name):
+    # Widgets inside re-run only this function. Such a partial rerun skips the
+    # module body, so it is profiled (and logged) as a rerun of its own.
+    def decorate(fn):
+        @st.fragment
+        @functools.wraps(fn)
+        def run(*args, **kwargs):
+            global profiler
+            partial = profiler.finished
+            if partial:
+                profiler = profiler.restart(f"fragment: {name}")
+            profiler.section(name)
+            fn(*args, **kwargs)
+            if partial:
+                profiler.finish()
+        return run
+    return decorate
+
+
+def render_profile():
+    record = profiler.finish()
+    if record is None:
+        return
+    history = st.session_state.setdefault("profile_history", [])
+    history.append(record)
+    del history[:-200]
+    with st.sidebar:
+        st.markdown("---")
+        st.markdown("## ⏱️ Rerun Profile")
+        st.plotly_chart(waterfall_figure(record), width="stretch")
+        total = latency_percentiles(history).loc["(app)"]
+        st.caption(f"This session: p50 **{total['p50_ms']:.0f} ms** · p95 **{total['p95_ms']:.0f} ms** "
+                   f"over {int(total['reruns'])} reruns")
+        st.dataframe([{"Chart": k, "Payload KB": round(v / 1024, 1)} for k, v in record["payload_bytes"].items()],
+                     width="stretch", hide_index=True)
+
+
+# ─────────────────────────────────────────────
+#  DATA SOURCE — KPI_SOURCE (CSV/Parquet export) or synthetic, KPI_EMPLOYEES rows,
+#  KPI_COMPACT=1 for categorical / narrow-dtype columns, KPI_STORE_DIR to share
+#  the prepared tables between processes as memory-mapped Arrow files,
+#  KPI_REFRESH_SECONDS between change checks (0 = never), KPI_HISTORY_DIR for the
+#  monthly trend from a kpi.history store (last KPI_HISTORY_MONTHS months)
+# ─────────────────────────────────────────────
+def dataset_key(version):
+    return (SOURCE_URI, COMPACT, tuple(sorted(SOURCE_KWARGS.items())), version)
+
+
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache(maxbytes=int(os.environ.get("KPI_FIGURE_CACHE_MB", 256)) * 2**20)
+
+
+def prewarm(figures, snapshot):
+    # Runs before a version goes live, so the default view's first paint is all cache hits
+    prewarm_figures(figures, (dataset_key(snapshot.version), POINT_THRESHOLD),
+                    *snapshot.tables, snapshot.indexes, threshold=POINT_THRESHOLD)
+
+
+@st.cache_resource
+def get_refresher(uri, compact, **kwargs):
+    # One refresher per source for every session; only runs on a cache miss,
+    # so the nested stage (the first build) shows up only then
+    with profiler.stage("cache miss · load source"):
+        source = open_source(uri, **kwargs)
+        history = history_from_env()
+        if history is not None:
+            source = HistorySource(source, history, months=int(os.environ.get("KPI_HISTORY_MONTHS", 0)) or None)
+        return Refresher(source, compact, store=store_from_env(),
+                         interval=float(os.environ.get("KPI_REFRESH_SECONDS", 60)),
+                         prepare=functools.partial(prewarm, get_figure_cache())).start()
+
+
+@st.cache_resource
+def get_export_cache():
+    return LRUCache(maxsize=32, maxbytes=256 * 2**20)
+
+
+SOURCE_URI, COMPACT, SOURCE_KWARGS = source_from_env()
+POINT_THRESHOLD = int(os.environ.get("KPI_POINT_THRESHOLD", charts.POINT_THRESHOLD))
+
+profiler.section("load data")
+refresher = get_refresher(SOURCE_URI, COMPACT, **SOURCE_KWARGS)
+# The whole rerun (and its fragments) keeps this version and its indexes,
+# even if a newer one goes live meanwhile
+snapshot = refresher.current
+df, trend_df, proj_df = snapshot.tables
+DATASET_KEY = dataset_key(snapshot.version)
 
 # ─────────────────────────────────────────────
 #  SIDEBAR
 # ─────────────────────────────────────────────
+profiler.section("sidebar")
 with st.sidebar:
     st.markdown("## 🎛️ Filters")
     st.markdown("---")
 
-    all_projects = sorted(df["Primary_Project"].unique().tolist())
+    # Options and range come from the version's filter index, not a scan of df
+    defaults = default_filters(df, snapshot.indexes["filter_index"])
+
+    all_projects = defaults["project"]
     sel_project  = st.multiselect("Project", all_projects, default=all_projects)
 
-    all_depts   = sorted(df["Department"].unique().tolist())
+    all_depts   = defaults["department"]
     sel_dept    = st.multiselect("Department", all_depts, default=all_depts)
 
-    all_roles   = sorted(df["Role"].unique().tolist())
+    all_roles   = defaults["role"]
     sel_role    = st.multiselect("Role", all_roles, default=all_roles)
 
-    perf_opts   = list(PERF_COLORS_MAP.keys())
+    perf_opts   = defaults["level"]
     sel_perf    = st.multiselect("Performance Level", perf_opts, default=perf_opts)
 
-    kpi_range   = st.slider("KPI Score Range", 0, 100,
-                            (int(df["Overall_KPI"].min()), int(df["Overall_KPI"].max())))
-
-    st.markdown("---")
-    drill_metric = st.selectbox("Drill-down Metric",
-        ["Overall_KPI", "Completion_Rate", "On_Time_Rate", "Quality_Score", "Productivity"])
+    kpi_range   = st.slider("KPI Score Range", 0, 100, defaults["kpi_range"])
 
     st.markdown("---")
     st.caption(f"👥 Total Employees: **{len(df)}**")
     st.caption(f"📁 Total Projects: **{len(all_projects)}**")
+    st.caption(f"🗂️ Data version: **v{snapshot.version}** · loaded {format_age(snapshot.age_seconds)} ago")
+    if refresher.last_error is not None:
+        st.caption(f"⚠️ Last refresh failed, serving v{snapshot.version}: {refresher.last_error}")
 
 
 # ─────────────────────────────────────────────
 #  APPLY FILTERS
 # ─────────────────────────────────────────────
-filtered = df[
-    df["Primary_Project"].isin(sel_project) &
-    df["Department"].isin(sel_dept) &
-    df["Role"].isin(sel_role) &
-    df["Performance_Level"].isin(sel_perf) &
-    (df["Overall_KPI"] >= kpi_range[0]) &
-    (df["Overall_KPI"] <= kpi_range[1])
-].copy()
+profiler.section("filter + aggregate")
+filters = dict(project=sel_project, department=sel_dept, role=sel_role,
+               level=sel_perf, kpi_range=kpi_range)
+# Row positions from the index; the untouched default state reuses df as-is
+with profiler.stage("filter"):
+    rows, filter_key = apply_filters(snapshot.indexes["filter_index"], filters)
+with profiler.stage("aggregate"):
+    summary = snapshot.indexes["aggregator"].summary(filter_key, rows)
+inputs = filter_inputs(filter_key)
 
 
 # ─────────────────────────────────────────────
 #  HEADER
 # ─────────────────────────────────────────────
 st.markdown('<p class="hero-title">📊 Employee <span class="accent">Performance</span> KPI Dashboard</p>', unsafe_allow_html=True)
-st.markdown('<p class="hero-sub">100 Employees · Project-Based Tracking · Real-Time Filters</p>', unsafe_allow_html=True)
+st.markdown(f'<p class="hero-sub">{len(df):,} Employees · Project-Based Tracking · Real-Time Filters</p>', unsafe_allow_html=True)
 
-if len(filtered) == 0:
+if len(rows) == 0:
     st.warning("⚠️ No employees match the current filters. Please adjust your selections.")
+    render_profile()
     st.stop()
 
 
 # ─────────────────────────────────────────────
 #  KPI SUMMARY CARDS
 # ─────────────────────────────────────────────
+profiler.section("summary cards")
 st.markdown('<div class="section-hdr">📈 Summary KPIs</div>', unsafe_allow_html=True)
 
 k1, k2, k3, k4, k5, k6 = st.columns(6)
-k1.metric("👥 Employees",        len(filtered),
-          delta=f"{len(filtered)-len(df)} vs total")
-k2.metric("🎯 Avg KPI Score",    f"{filtered['Overall_KPI'].mean():.1f}",
-          delta=f"{filtered['Overall_KPI'].mean() - df['Overall_KPI'].mean():+.1f} vs all")
-k3.metric("✅ Avg Completion",   f"{filtered['Completion_Rate'].mean():.1f}%")
-k4.metric("⏰ Avg On-Time",      f"{filtered['On_Time_Rate'].mean():.1f}%")
-k5.metric("⭐ Avg Quality",      f"{filtered['Quality_Score'].mean():.1f}")
-k6.metric("🔴 Total Overdue",    int(filtered['Tasks_Overdue'].sum()))
+k1.metric("👥 Employees",        summary["count"],
+          delta=f"{summary['count']-len(df)} vs total")
+k2.metric("🎯 Avg KPI Score",    f"{summary['kpi_mean']:.1f}",
+          delta=f"{summary['kpi_delta']:+.1f} vs all")
+k3.metric("✅ Avg Completion",   f"{summary['completion_mean']:.1f}%")
+k4.metric("⏰ Avg On-Time",      f"{summary['on_time_mean']:.1f}%")
+k5.metric("⭐ Avg Quality",      f"{summary['quality_mean']:.1f}")
+k6.metric("🔴 Total Overdue",    summary["overdue_total"])
 
 
 # ─────────────────────────────────────────────
 #  ROW 1: KPI DISTRIBUTION + PERFORMANCE PIE
 # ─────────────────────────────────────────────
+profiler.section("row 1 · overview")
 st.markdown('<div class="section-hdr">📊 Performance Overview</div>', unsafe_allow_html=True)
 r1c1, r1c2, r1c3 = st.columns([2, 1, 1])
 
 with r1c1:
-    fig = px.histogram(filtered, x="Overall_KPI", nbins=20,
-        color="Performance_Level",
-        color_discrete_map=PERF_COLORS_MAP,
-        title="KPI Score Distribution by Performance Level",
-        labels={"Overall_KPI": "Overall KPI Score", "Performance_Level": "Level"})
-    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
-        font_color="#94a3b8", title_font_size=13, bargap=0.05,
-        xaxis=dict(gridcolor="#1e2235", color="#64748b"),
-        yaxis=dict(gridcolor="#1e2235", color="#64748b"),
-        legend=dict(font=dict(size=10), bgcolor="#1a1d27"),
-        margin=dict(l=10, r=10, t=40, b=10))
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart("kpi_histogram", inputs, charts.kpi_histogram, df, rows, threshold=POINT_THRESHOLD)
 
 with r1c2:
-    perf_vc = filtered["Performance_Level"].value_counts().reset_index()
-    perf_vc.columns = ["Level", "Count"]
-    fig2 = px.pie(perf_vc, names="Level", values="Count",
-        title="Performance Breakdown", hole=0.5,
-        color="Level", color_discrete_map=PERF_COLORS_MAP)
-    fig2.update_traces(textposition="outside", textfont_size=10)
-    fig2.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
-        font_color="#94a3b8", title_font_size=13, showlegend=False,
-        margin=dict(l=10, r=10, t=40, b=10))
-    st.plotly_chart(fig2, use_container_width=True)
+    show_chart("performance_pie", inputs, charts.performance_pie, summary["perf_counts"])
 
 with r1c3:
-    dept_kpi = filtered.groupby("Department")["Overall_KPI"].mean().round(1).reset_index()
-    dept_kpi = dept_kpi.sort_values("Overall_KPI", ascending=True)
-    fig3 = px.bar(dept_kpi, x="Overall_KPI", y="Department", orientation="h",
-        title="Avg KPI by Department",
-        color="Overall_KPI", color_continuous_scale=["#f87171","#fbbf24","#34d399"],
-        text_auto=True)
-    fig3.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
-        font_color="#94a3b8", title_font_size=13, coloraxis_showscale=False,
-        xaxis=dict(gridcolor="#1e2235", range=[0,105]),
-        yaxis=dict(gridcolor="#1e2235"),
-        margin=dict(l=10, r=10, t=40, b=10))
-    st.plotly_chart(fig3, use_container_width=True)
+    show_chart("department_kpi", inputs, charts.department_kpi_bar, summary["dept_kpi"])
 
 
 # ─────────────────────────────────────────────
 #  ROW 2: PROJECT ANALYSIS
 # ─────────────────────────────────────────────
+profiler.section("row 2 · projects")
 st.markdown('<div class="section-hdr">📁 Project Performance Analysis</div>', unsafe_allow_html=True)
 
-proj_filtered = proj_df[proj_df["Project"].isin(sel_project)].copy()
+proj_filtered = project_view(proj_df, sel_project)
 
 r2c1, r2c2 = st.columns([3, 2])
 
 with r2c1:
-    fig_proj = px.bar(proj_filtered.sort_values("Avg_KPI", ascending=False),
-        x="Project", y=["Avg_KPI", "Avg_Completion", "Avg_Quality"],
-        title="Project KPI Comparison",
-        barmode="group",
-        color_discrete_sequence=["#60a5fa","#34d399","#a78bfa"],
-        labels={"value": "Score", "variable": "Metric"})
-    fig_proj.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
-        font_color="#94a3b8", title_font_size=13,
-        xaxis=dict(gridcolor="#1e2235", tickangle=-20),
-        yaxis=dict(gridcolor="#1e2235", range=[0,110]),
-        legend=dict(bgcolor="#1a1d27", font=dict(size=10)),
-        margin=dict(l=10, r=10, t=40, b=40))
-    st.plotly_chart(fig_proj, use_container_width=True)
+    show_chart("project_kpi", inputs, charts.project_comparison_bar, proj_filtered)
 
 with r2c2:
-    fig_bubble = px.scatter(proj_filtered,
-        x="Avg_Completion", y="Avg_KPI",
-        size="Team_Size", color="Avg_Quality",
-        hover_name="Project",
-        hover_data={"Overdue_Tasks": True, "Team_Size": True},
-        title="Project Health: Completion vs KPI",
-        color_continuous_scale=["#f87171","#fbbf24","#34d399"],
-        size_max=50)
-    fig_bubble.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
-        font_color="#94a3b8", title_font_size=13,
-        xaxis=dict(gridcolor="#1e2235", title="Avg Completion Rate %"),
-        yaxis=dict(gridcolor="#1e2235", title="Avg KPI Score"),
-        coloraxis_colorbar=dict(title="Quality", tickfont=dict(color="#94a3b8")),
-        margin=dict(l=10, r=10, t=40, b=10))
-    st.plotly_chart(fig_bubble, use_container_width=True)
+    show_chart("project_bubble", inputs, charts.project_bubble, proj_filtered)
 
 
 # ─────────────────────────────────────────────
 #  ROW 3: TASK STATUS + MONTHLY TREND
 # ─────────────────────────────────────────────
+profiler.section("row 3 · tasks + trend")
 st.markdown('<div class="section-hdr">📅 Task Tracking & Monthly Trends</div>', unsafe_allow_html=True)
 r3c1, r3c2 = st.columns([1, 2])
 
 with r3c1:
-    task_data = {
-        "Status": ["Completed", "In Progress / Pending", "Overdue"],
-        "Count": [
-            int(filtered["Tasks_Completed"].sum()),
-            int((filtered["Tasks_Assigned"] - filtered["Tasks_Completed"] - filtered["Tasks_Overdue"]).clip(lower=0).sum()),
-            int(filtered["Tasks_Overdue"].sum())
-        ]
-    }
-    fig_task = px.pie(pd.DataFrame(task_data), names="Status", values="Count",
-        title="Overall Task Status", hole=0.55,
-        color="Status",
-        color_discrete_map={"Completed":"#34d399","In Progress / Pending":"#60a5fa","Overdue":"#f87171"})
-    fig_task.update_traces(textposition="outside", textfont_size=11)
-    fig_task.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
-        font_color="#94a3b8", title_font_size=13,
-        legend=dict(font=dict(size=10), bgcolor="#1a1d27"),
-        margin=dict(l=10, r=10, t=40, b=10))
-    st.plotly_chart(fig_task, use_container_width=True)
+    show_chart("task_status", inputs, charts.task_status_pie, summary["task_status"])
 
 with r3c2:
-    tf = trend_df[trend_df["Department"].isin(sel_dept)]
-    fig_trend = px.line(tf, x="Month", y="KPI_Score", color="Department",
-        markers=True, title="Monthly KPI Trend by Department",
-        color_discrete_sequence=DEPT_COLORS)
-    fig_trend.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
-        font_color="#94a3b8", title_font_size=13,
-        xaxis=dict(gridcolor="#1e2235"),
-        yaxis=dict(gridcolor="#1e2235", range=[45, 105]),
-        legend=dict(orientation="h", y=-0.25, bgcolor="#1a1d27", font=dict(size=10)),
-        margin=dict(l=10, r=10, t=40, b=40))
-    st.plotly_chart(fig_trend, use_container_width=True)
+    show_chart("department_trend", inputs, lambda: charts.department_trend(trend_view(trend_df, sel_dept)))
 
 
 # ─────────────────────────────────────────────
-#  ROW 4: DRILL-DOWN + RADAR
+#  ROW 4: DRILL-DOWN + RADAR — the drill-down controls re-run this row only
 # ─────────────────────────────────────────────
-st.markdown(f'<div class="section-hdr">🔍 Drill-Down: {drill_metric.replace("_"," ")}</div>', unsafe_allow_html=True)
-r4c1, r4c2 = st.columns([2, 1])
-
-with r4c1:
-    top10 = filtered.nlargest(10, drill_metric)[["Name","Department","Primary_Project", drill_metric,"Overall_KPI"]]
-    fig_top = px.bar(top10.sort_values(drill_metric),
-        x=drill_metric, y="Name", orientation="h",
-        color=drill_metric, color_continuous_scale=["#3b82f6","#34d399"],
-        title=f"Top 10 Employees — {drill_metric.replace('_',' ')}",
-        hover_data={"Department": True, "Primary_Project": True, "Overall_KPI": True},
-        text_auto=True)
-    fig_top.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
-        font_color="#94a3b8", title_font_size=13, coloraxis_showscale=False,
-        xaxis=dict(gridcolor="#1e2235", range=[0, 110]),
-        yaxis=dict(gridcolor="#1a1d27"),
-        margin=dict(l=10, r=10, t=40, b=10))
-    st.plotly_chart(fig_top, use_container_width=True)
-
-with r4c2:
-    cats   = ["Productivity", "Completion", "On-Time", "Quality", "Collaboration", "Initiative"]
-    vals   = [
-        float(filtered["Productivity"].mean()),
-        float(filtered["Completion_Rate"].mean()),
-        float(filtered["On_Time_Rate"].mean()),
-        float(filtered["Quality_Score"].mean()),
-        float(filtered["Collaboration"].mean()),
-        float(filtered["Initiative"].mean()),
-    ]
-    fig_radar = go.Figure(go.Scatterpolar(
-        r=vals + [vals[0]], theta=cats + [cats[0]],
-        fill="toself", fillcolor="rgba(96,165,250,0.15)",
-        line=dict(color="#60a5fa", width=2),
-        marker=dict(color="#60a5fa", size=6)
-    ))
-    fig_radar.update_layout(
-        polar=dict(bgcolor="#1a1d27",
-            radialaxis=dict(visible=True, range=[0,100], gridcolor="#2d3144", color="#64748b", tickfont=dict(size=9)),
-            angularaxis=dict(gridcolor="#2d3144", color="#94a3b8")),
-        paper_bgcolor="#1a1d27", font_color="#94a3b8",
-        title=dict(text="Avg Performance Radar", font=dict(size=13, color="#94a3b8")),
-        showlegend=False,
-        margin=dict(l=30, r=30, t=50, b=30))
-    st.plotly_chart(fig_radar, use_container_width=True)
+@fragment_section("row 4 · drill-down")
+def drill_down_section():
+    hdr = st.empty()
+    d1, d2, d3, _ = st.columns([1, 1, 1, 1])
+    drill_metric = d1.selectbox("Drill-down Metric", RANK_METRICS)
+    top_n = d2.number_input("Top N", min_value=1, max_value=50, value=DEFAULT_INPUTS["top_n"], step=1)
+    per_department = d3.toggle("Per department", value=DEFAULT_INPUTS["per_department"])
+    hdr.markdown(f'<div class="section-hdr">🔍 Drill-Down: {drill_metric.replace("_"," ")}</div>', unsafe_allow_html=True)
+    r4c1, r4c2 = st.columns([2, 1])
+
+    with r4c1:
+        # Walks the presorted order for this metric; no sort of the selection
+        show_chart("top_employees", dict(inputs, drill_metric=drill_metric, top_n=top_n, per_department=per_department),
+                   lambda: charts.top_employees_bar(
+                       top_employees(df, snapshot.indexes["sort_index"], rows, drill_metric, top_n, per_department),
+                       drill_metric, by_department=per_department))
+
+    with r4c2:
+        show_chart("radar", inputs, charts.performance_radar, *summary["radar"])
+
+
+drill_down_section()
 
 
 # ─────────────────────────────────────────────
 #  ROW 5: SCATTER — PRODUCTIVITY vs QUALITY
 # ─────────────────────────────────────────────
-st.markdown('<div class="section-hdr">🔬 Productivity vs Quality Scatter</div>', unsafe_allow_html=True)
-
-fig_pq = px.scatter(filtered, x="Productivity", y="Quality_Score",
-    color="Department", symbol="Performance_Level",
-    hover_name="Name",
-    hover_data={"Primary_Project": True, "Overall_KPI": True, "Role": True},
-    size="Tasks_Completed", size_max=18,
-    title="Productivity vs Quality (size = Tasks Completed)",
-    color_discrete_sequence=DEPT_COLORS)
-fig_pq.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
-    font_color="#94a3b8", title_font_size=13,
-    xaxis=dict(gridcolor="#1e2235", title="Productivity Score"),
-    yaxis=dict(gridcolor="#1e2235", title="Quality Score"),
-    legend=dict(bgcolor="#1a1d27", font=dict(size=10)),
-    margin=dict(l=10, r=10, t=40, b=10))
-st.plotly_chart(fig_pq, use_container_width=True)
+@fragment_section("row 5 · scatter")
+def scatter_section():
+    st.markdown('<div class="section-hdr">🔬 Productivity vs Quality Scatter</div>', unsafe_allow_html=True)
+
+    pq_mode = "sample"
+    if len(rows) > POINT_THRESHOLD:
+        pq_mode = st.radio("Large selection", ["sample", "density"], horizontal=True,
+            format_func={"sample": "Sampled points (WebGL)", "density": "Binned density"}.get)
+    show_chart("productivity_quality", dict(inputs, pq_mode=pq_mode), charts.productivity_quality_scatter,
+               df, rows, threshold=POINT_THRESHOLD, mode=pq_mode)
+
+
+scatter_section()
 
 
 # ─────────────────────────────────────────────
-#  PROJECT SUMMARY TABLE (clean — no styling)
+#  ROW 6: WHAT-IF WEIGHTING — sliders re-run this row only, built only while expanded
 # ─────────────────────────────────────────────
-st.markdown('<div class="section-hdr">📋 Project Summary Table</div>', unsafe_allow_html=True)
-st.dataframe(
-    proj_filtered.sort_values("Avg_KPI", ascending=False).reset_index(drop=True),
-    use_container_width=True,
-    height=320
-)
+@fragment_section("row 6 · what-if")
+def what_if_section():
+    section = st.expander("⚖️ What-if KPI Weighting", key="show_what_if", on_change="rerun")
+    if not section.open:
+        return
+    with section:
+        st.caption("Relative weight of each score in Overall_KPI; weights are rescaled to sum to 100%.")
+        weights = {}
+        for col, metric in zip(st.columns(len(SCORE_COLUMNS)), SCORE_COLUMNS):
+            weights[metric] = col.slider(metric.replace("_", " "), 0, 100,
+                                         int(round(DEFAULT_WEIGHTS[metric] * 100)), step=5,
+                                         key=f"weight_{metric}")
+        if not any(weights.values()):
+            st.warning("⚠️ Give at least one score a weight.")
+            return
+
+        # One mat-vec over the score matrix; the DataFrame is not rebuilt
+        with profiler.stage("what-if"):
+            result = snapshot.indexes["weights"].summary(filter_key, rows, weights)
+        w_inputs = dict(inputs, weights=weight_key(weights))
+
+        w1, w2, w3, w4 = st.columns(4)
+        w1.metric("🎯 What-if Avg KPI", f"{result['kpi_mean']:.1f}",
+                  delta=f"{result['kpi_mean'] - result['current_mean']:+.1f} vs current")
+        w2.metric("🔀 Level changes",  f"{result['moved']:,}")
+        w3.metric("⬆️ Promoted",       f"{result['promoted']:,}")
+        w4.metric("⬇️ Demoted",        f"{result['demoted']:,}")
+
+        r6c1, r6c2 = st.columns([1, 1])
+        with r6c1:
+            show_chart("whatif_levels", w_inputs, charts.whatif_levels_bar, result["levels"])
+        with r6c2:
+            show_chart("whatif_top", w_inputs, charts.top_employees_bar, result["top"], "What_if_KPI")
+
+        show_chart("whatif_projects", w_inputs, charts.whatif_project_bar, result["projects"])
+        st.dataframe(result["departments"], width="stretch", hide_index=True)
+
+
+what_if_section()
 
 
 # ─────────────────────────────────────────────
-#  EMPLOYEE DETAIL TABLE (no pandas styling — avoids ValueError)
+#  PROJECT SUMMARY TABLE (clean — no styling) — built only while expanded
 # ─────────────────────────────────────────────
-st.markdown('<div class="section-hdr">👤 Employee Detail Table</div>', unsafe_allow_html=True)
+@fragment_section("project table")
+def project_table_section():
+    section = st.expander("📋 Project Summary Table", key="show_project_table", on_change="rerun")
+    if not section.open:
+        return
+    with section:
+        st.dataframe(
+            proj_filtered.sort_values("Avg_KPI", ascending=False).reset_index(drop=True),
+            width="stretch",
+            height=320
+        )
 
-show_cols = ["ID","Name","Department","Role","Primary_Project",
-             "Tasks_Assigned","Tasks_Completed","Tasks_Overdue",
-             "Completion_Rate","On_Time_Rate","Quality_Score",
-             "Productivity","Overall_KPI","Performance_Level"]
 
-display_df = filtered[show_cols].sort_values("Overall_KPI", ascending=False).reset_index(drop=True)
+project_table_section()
 
-# Use plain st.dataframe — no .style to avoid ValueError on newer Pandas/Streamlit
-st.dataframe(display_df, use_container_width=True, height=420)
 
-# Download
-csv_bytes = display_df.to_csv(index=False).encode("utf-8")
-st.download_button(
-    label="⬇️  Export Employee Data as CSV",
-    data=csv_bytes,
-    file_name="employee_kpi_export.csv",
-    mime="text/csv"
-)
+# ─────────────────────────────────────────────
+#  EMPLOYEE DETAIL TABLE (no pandas styling — avoids ValueError) — built only while expanded
+# ─────────────────────────────────────────────
+@fragment_section("employee table")
+def employee_table_section():
+    section = st.expander("👤 Employee Detail Table", key="show_employee_table", on_change="rerun")
+    if not section.open:
+        return
+    with section:
+        sort_index = snapshot.indexes["sort_index"]
+
+        t1, t2, t3, t4 = st.columns([2, 1, 1, 1])
+        sort_col  = t1.selectbox("Sort by", SHOW_COLS, index=SHOW_COLS.index("Overall_KPI"))
+        sort_desc = t2.selectbox("Order", ["Descending", "Ascending"]) == "Descending"
+        page_size = t3.selectbox("Rows per page", PAGE_SIZES, index=1)
+        n_pages   = page_count(len(rows), page_size)
+        page      = t4.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages, value=1, step=1)
+
+        # Only the visible page is sorted out of the presorted index and serialized
+        with profiler.stage("page"):
+            page_df, offset = table_page(df, sort_index, rows, sort_col, not sort_desc, int(page), page_size)
+        st.caption(f"Rows {offset + 1:,}–{offset + len(page_df):,} of {len(rows):,}")
+
+        # Use plain st.dataframe — no .style to avoid ValueError on newer Pandas/Streamlit
+        st.dataframe(page_df, width="stretch", height=420)
+
+        # Download — serialized only when the button is clicked, then reused for the same filters and format
+        export_fmt = st.radio("Export format", list(EXPORT_FORMATS), horizontal=True,
+            format_func=lambda f: EXPORT_FORMATS[f]["label"])
+        export_key = (DATASET_KEY, filter_key, export_fmt)
+        export_cache = get_export_cache()
+
+        def build_export():
+            # Streamlit calls this on click, outside any rerun, so the build is
+            # profiled (and logged) as a record of its own, like a fragment rerun
+            export_profiler = profiler.restart(f"export: {export_fmt}")
+            data = export_cache.get(export_key)
+            if data is None:
+                with export_profiler.stage(f"serialize {export_fmt}"):
+                    # One gather of the selected rows and shown columns
+                    positions = sort_index.ordered(rows, "Overall_KPI", ascending=False)
+                    display_df = df.iloc[positions, df.columns.get_indexer(SHOW_COLS)]
+                    data = export_cache.put(export_key, export_bytes(display_df, export_fmt))
+            export_profiler.finish()
+            return data
+
+        st.download_button(
+            label=f"⬇️  Export Employee Data as {EXPORT_FORMATS[export_fmt]['label']}",
+            data=build_export,
+            file_name=export_file_name("employee_kpi_export", export_fmt),
+            mime=EXPORT_FORMATS[export_fmt]["mime"],
+            on_click="ignore",
+        )
+
+
+employee_table_section()
 
 st.markdown("---")
-st.caption("Employee Performance KPI Dashboard · 100 Employees · Project-Based · Built with Streamlit & Plotly")
+st.caption(f"Employee Performance KPI Dashboard · {len(df):,} Employees · Project-Based · Built with Streamlit & Plotly")
+
+render_profile()
@@ -0,0 +1,73 @@
+"""Sidebar filtering: isin mask + .copy() vs the precomputed FilterIndex.
+
+    python -m benchmarks.bench_filters --sizes 100000 1000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from kpi.data import generate_data
+from kpi.filters import FilterIndex
+from kpi.schema import to_compact
+
+
+def legacy_filter(df, project, department, role, level, kpi_range):
+    return df[
+        df["Primary_Project"].isin(project) &
+        df["Department"].isin(department) &
+        df["Role"].isin(role) &
+        df["Performance_Level"].isin(level) &
+        (df["Overall_KPI"] >= kpi_range[0]) &
+        (df["Overall_KPI"] <= kpi_range[1])
+    ].copy()
+
+
+def scenarios(df):
+    projects = sorted(df["Primary_Project"].unique())
+    depts    = sorted(df["Department"].unique())
+    roles    = sorted(df["Role"].unique())
+    levels   = sorted(df["Performance_Level"].unique())
+    return {
+        "all":         dict(project=projects, department=depts, role=roles, level=levels, kpi_range=(0, 100)),
+        "one project": dict(project=projects[:1], department=depts, role=roles, level=levels, kpi_range=(0, 100)),
+        "mixed":       dict(project=projects[:5], department=depts[1:], role=roles[:3], level=levels[1:],
+                            kpi_range=(60, 90)),
+        "kpi slider":  dict(project=projects, department=depts, role=roles, level=levels, kpi_range=(70, 80)),
+    }
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--compact", action="store_true")
+    args = parser.parse_args(argv)
+
+    print(f"{'employees':>10}  {'scenario':<12}  {'rows':>9}  {'legacy ms':>10}  {'index ms':>9}")
+    for n in args.sizes:
+        df = generate_data(n)[0]
+        if args.compact:
+            df = to_compact(df)
+        t0 = time.perf_counter()
+        index = FilterIndex(df)
+        print(f"{n:>10,}  {'(build)':<12}  {'':>9}  {'':>10}  {(time.perf_counter() - t0) * 1000:>9.1f}")
+        for name, sel in scenarios(df).items():
+            rows = index.select(**sel)
+            assert np.array_equal(rows, np.flatnonzero(df.index.isin(legacy_filter(df, **sel).index)))
+            leg = best_of(lambda: legacy_filter(df, **sel), args.repeat)
+            new = best_of(lambda: index.select(**sel), args.repeat)
+            print(f"{n:>10,}  {name:<12}  {len(rows):>9,}  {leg:>10.1f}  {new:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Vectorized generate_data() vs the original per-employee loop.
+
+    python -m benchmarks.bench_generate --sizes 1000 10000 100000
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+import pandas as pd
+
+from kpi.data import DEPARTMENTS, FIRST_NAMES, LAST_NAMES, MONTHS, PROJECTS, ROLES, generate_data
+
+
+# Original loop from app.py, kept as the reference implementation.
+# Names wrap around so it can run past 100 employees.
+def legacy_generate_data(n_employees=100):
+    random.seed(99)
+    np.random.seed(99)
+
+    departments, roles, projects = DEPARTMENTS, ROLES, PROJECTS
+
+    records = []
+    for i in range(n_employees):
+        dept      = departments[i % len(departments)]
+        role      = random.choice(roles)
+        project   = random.choice(projects)
+        proj2     = random.choice([p for p in projects if p != project]) if random.random() > 0.5 else None
+
+        tasks_assigned  = int(np.random.randint(15, 80))
+        tasks_completed = int(tasks_assigned * np.random.uniform(0.55, 1.0))
+        tasks_overdue   = int(np.random.randint(0, max(1, tasks_assigned - tasks_completed + 1)))
+
+        quality    = round(float(np.random.uniform(50, 100)), 1)
+        ontime     = round(float(np.random.uniform(45, 100)), 1)
+        collab     = round(float(np.random.uniform(50, 100)), 1)
+        initiative = round(float(np.random.uniform(50, 100)), 1)
+        prod_score = round(float(np.random.uniform(50, 100)), 1)
+
+        name = f"{FIRST_NAMES[i % len(FIRST_NAMES)]} {LAST_NAMES[i % len(LAST_NAMES)]}"
+
+        records.append({
+            "ID":               f"EMP{1000+i+1}",
+            "Name":             name,
+            "Department":       dept,
+            "Role":             role,
+            "Primary_Project":  project,
+            "Secondary_Project": proj2 if proj2 else "—",
+            "Tasks_Assigned":   tasks_assigned,
+            "Tasks_Completed":  tasks_completed,
+            "Tasks_Overdue":    tasks_overdue,
+            "Quality_Score":    quality,
+            "On_Time_Rate":     ontime,
+            "Collaboration":    collab,
+            "Initiative":       initiative,
+            "Productivity":     prod_score,
+        })
+
+    df = pd.DataFrame(records)
+    df["Completion_Rate"] = (df["Tasks_Completed"] / df["Tasks_Assigned"] * 100).round(1)
+    df["Overall_KPI"] = (
+        df["Productivity"]      * 0.25 +
+        df["Completion_Rate"]   * 0.25 +
+        df["On_Time_Rate"]      * 0.20 +
+        df["Quality_Score"]     * 0.20 +
+        df["Collaboration"]     * 0.10
+    ).round(1)
+
+    def assign_level(s):
+        if s >= 88:  return "🏆 Outstanding"
+        elif s >= 78: return "⭐ Excellent"
+        elif s >= 68: return "✅ Good"
+        elif s >= 55: return "⚠️ Needs Improvement"
+        else:         return "🔴 Critical"
+
+    df["Performance_Level"] = df["Overall_KPI"].apply(assign_level)
+
+    trend_rows = []
+    for dept in departments:
+        score = int(np.random.randint(65, 82))
+        for m in MONTHS:
+            score = max(50, min(100, score + int(np.random.randint(-5, 7))))
+            trend_rows.append({"Month": m, "Department": dept, "KPI_Score": score})
+
+    proj_rows = []
+    for proj in projects:
+        proj_df = df[df["Primary_Project"] == proj]
+        if len(proj_df) == 0:
+            continue
+        proj_rows.append({
+            "Project": proj,
+            "Team_Size": len(proj_df),
+            "Avg_KPI": round(proj_df["Overall_KPI"].mean(), 1),
+            "Avg_Completion": round(proj_df["Completion_Rate"].mean(), 1),
+            "Avg_Quality": round(proj_df["Quality_Score"].mean(), 1),
+            "Total_Tasks": proj_df["Tasks_Assigned"].sum(),
+            "Completed_Tasks": proj_df["Tasks_Completed"].sum(),
+            "Overdue_Tasks": proj_df["Tasks_Overdue"].sum(),
+        })
+
+    return df, pd.DataFrame(trend_rows), pd.DataFrame(proj_rows)
+
+
+def best_of(fn, n, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(n)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--legacy-max", type=int, default=100_000,
+                        help="skip the legacy loop above this many employees")
+    args = parser.parse_args(argv)
+
+    a, b = generate_data(1_000), generate_data(1_000)
+    assert all(x.equals(y) for x, y in zip(a, b)), "generate_data() is not deterministic"
+
+    print(f"{'employees':>10}  {'legacy s':>10}  {'vector s':>10}  {'speedup':>8}")
+    for n in args.sizes:
+        vec = best_of(generate_data, n, args.repeat)
+        if n <= args.legacy_max:
+            leg = best_of(legacy_generate_data, n, 1)
+            print(f"{n:>10,}  {leg:>10.3f}  {vec:>10.3f}  {leg / vec:>7.1f}x")
+        else:
+            print(f"{n:>10,}  {'—':>10}  {vec:>10.3f}  {'—':>8}")
+
+
+if __name__ == "__main__":
+    main()
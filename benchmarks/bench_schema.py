@@ -0,0 +1,75 @@
+"""Memory and filter/groupby latency: default layout vs compact schema.
+
+    python -m benchmarks.bench_schema --sizes 100000 1000000
+"""
+import argparse
+import time
+
+from kpi.data import generate_data
+from kpi.schema import to_compact
+
+
+def _filter(df, sel):
+    return df[
+        df["Primary_Project"].isin(sel["project"]) &
+        df["Department"].isin(sel["dept"]) &
+        df["Role"].isin(sel["role"]) &
+        df["Performance_Level"].isin(sel["perf"]) &
+        (df["Overall_KPI"] >= 40) &
+        (df["Overall_KPI"] <= 95)
+    ]
+
+
+def _groupby(df):
+    return df.groupby("Department", observed=True)["Overall_KPI"].mean()
+
+
+def _value_counts(df):
+    return df["Performance_Level"].value_counts()
+
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def report(df, repeat=5):
+    # Drop one value per dimension so the isin calls do real work
+    sel = {
+        "project": sorted(df["Primary_Project"].unique())[1:],
+        "dept":    sorted(df["Department"].unique())[1:],
+        "role":    sorted(df["Role"].unique())[1:],
+        "perf":    sorted(df["Performance_Level"].unique())[1:],
+    }
+    rows = []
+    for name, frame in (("default", df), ("compact", to_compact(df))):
+        rows.append({
+            "layout":     name,
+            "memory_mb":  frame.memory_usage(deep=True).sum() / 2**20,
+            "filter_ms":  best_of(lambda: _filter(frame, sel), repeat),
+            "groupby_ms": best_of(lambda: _groupby(frame), repeat),
+            "counts_ms":  best_of(lambda: _value_counts(frame), repeat),
+        })
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    print(f"{'employees':>10}  {'layout':<8}  {'memory MB':>10}  {'filter ms':>10}  {'groupby ms':>10}  {'counts ms':>10}")
+    for n in args.sizes:
+        df = generate_data(n)[0]
+        for r in report(df, args.repeat):
+            print(f"{n:>10,}  {r['layout']:<8}  {r['memory_mb']:>10.1f}  {r['filter_ms']:>10.1f}"
+                  f"  {r['groupby_ms']:>10.1f}  {r['counts_ms']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
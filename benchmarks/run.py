@@ -0,0 +1,225 @@
+"""Headless benchmark of the dashboard pipeline: wall time, peak memory and figure payload per stage.
+
+    python -m benchmarks.run                                  # 1k / 100k / 1M, compare with baseline
+    python -m benchmarks.run --sizes 1000 100000 1000000 5000000
+    python -m benchmarks.run --update-baseline                # record the current numbers
+
+Each stage is timed --repeat times and the best run is kept; peak memory
+comes from one extra traced run. Exits non-zero when
+a stage is slower (or uses more memory) than the stored baseline by more
+than --tolerance.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from kpi import pipeline
+from kpi.store import DatasetStore
+from kpi.weights import DEFAULT_WEIGHTS
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+DEFAULT_REPEAT = 3
+
+# Differences below these are noise, whatever the ratio
+MIN_SECONDS_DELTA = 0.02
+MIN_PEAK_MB_DELTA = 8.0
+
+# A slider move in the what-if panel: Initiative in, Collaboration down
+WHAT_IF_WEIGHTS = dict(DEFAULT_WEIGHTS, Collaboration=0.05, Initiative=0.15)
+
+
+def _proc_status_kb(field):
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    raise KeyError(field)
+
+
+def _can_reset_peak_rss():
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        _proc_status_kb("VmHWM")
+        return True
+    except (OSError, KeyError):
+        return False
+
+
+# Linux also reports the stage's peak RSS, which covers memory that bypasses
+# tracemalloc (e.g. Arrow's pool during the load)
+USE_RSS = _can_reset_peak_rss()
+
+
+def _peak_mb(fn):
+    # Traced once, apart from the timed runs, since tracing slows allocation.
+    # NumPy reports its buffers to tracemalloc, so an allocation counts even
+    # when it reuses memory an earlier stage freed and RSS doesn't move.
+    gc.collect()
+    if USE_RSS:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        start_kb = _proc_status_kb("VmRSS")
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    if USE_RSS:
+        peak = max(peak, (_proc_status_kb("VmHWM") - start_kb) * 1024)
+    return peak / 2**20
+
+
+def _seconds(fn):
+    gc.collect()
+    t0 = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - t0
+
+
+def measure(fn, repeat=1, reset=None):
+    # Peak memory from one traced run; wall time is the best of `repeat`
+    # untraced runs, as scheduler noise only ever adds time. `reset` runs
+    # before each, e.g. to empty a cache.
+    if reset is not None:
+        reset()
+    peak_mb = _peak_mb(fn)
+    best = float("inf")
+    for _ in range(repeat):
+        if reset is not None:
+            reset()
+        result, seconds = _seconds(fn)
+        best = min(best, seconds)
+    return result, {"seconds": best, "peak_mb": peak_mb}
+
+
+def run_pipeline(n_employees, compact=False, store=None, repeat=1):
+    stages = {}
+
+    def stage(name, fn, reset=None):
+        result, stats = measure(fn, repeat, reset)
+        stages[name] = stats
+        return result
+
+    df, trend_df, proj_df = stage("load", lambda: pipeline.load_dataset(
+        f"synthetic://{n_employees}", compact, store=store))
+    idx = stage("build_indexes", lambda: pipeline.build_indexes(df))
+
+    default = pipeline.default_filters(df, idx["filter_index"])
+    narrowed = dict(default,
+                    project=default["project"][:3],
+                    department=default["department"][1:],
+                    kpi_range=(60, 90))
+
+    for label, filters in (("default", default), ("narrowed", narrowed)):
+        rows, key = stage(f"filter[{label}]", lambda: pipeline.apply_filters(idx["filter_index"], filters))
+        # The cold stages start from an empty cache on every repeat
+        summary = stage(f"aggregate[{label}]", lambda: idx["aggregator"].summary(key, rows),
+                        reset=idx["aggregator"].cache.clear)
+        stage(f"aggregate_hit[{label}]", lambda: idx["aggregator"].summary(key, rows))
+        stage(f"what_if[{label}]", lambda: idx["weights"].summary(key, rows, WHAT_IF_WEIGHTS),
+              reset=idx["weights"].cache.clear)
+
+        top = stage(f"top_n[{label}]", lambda: pipeline.top_employees(
+            df, idx["sort_index"], rows, "Quality_Score", n=10))
+        stage(f"top_n_by_dept[{label}]", lambda: pipeline.top_employees(
+            df, idx["sort_index"], rows, "Quality_Score", n=10, per_department=True))
+
+        figures = stage(f"figures[{label}]", lambda: pipeline.build_figures(
+            df, rows, summary,
+            pipeline.project_view(proj_df, filters["project"]),
+            pipeline.trend_view(trend_df, filters["department"]), top))
+        payload = stage(f"figure_json[{label}]", lambda: {k: len(f.to_json()) for k, f in figures.items()})
+        stages[f"figure_json[{label}]"]["json_bytes"] = sum(payload.values())
+        stages[f"figure_json[{label}]"]["per_chart"] = payload
+
+        stage(f"table_page[{label}]", lambda: pipeline.employee_page(df, idx["sort_index"], rows))
+
+    return stages
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for size, stages in results.items():
+        for name, stats in stages.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            for metric, floor in (("seconds", MIN_SECONDS_DELTA), ("peak_mb", MIN_PEAK_MB_DELTA)):
+                new, old = stats[metric], base[metric]
+                # A baseline below the floor (e.g. 0.0 MB) is compared as the floor
+                if new > max(old, floor) * (1 + tolerance) and new - old > floor:
+                    regressions.append((size, name, metric, old, new))
+            if "json_bytes" in base and stats.get("json_bytes", 0) > base["json_bytes"] * (1 + tolerance):
+                regressions.append((size, name, "json_bytes", base["json_bytes"], stats["json_bytes"]))
+    return regressions
+
+
+def print_table(results, baseline):
+    print(f"{'employees':>10}  {'stage':<24}  {'seconds':>9}  {'base s':>9}  {'peak MB':>9}  {'json KB':>9}")
+    for size, stages in results.items():
+        for name, stats in stages.items():
+            base = baseline.get(size, {}).get(name, {})
+            base_s = f"{base['seconds']:.3f}" if "seconds" in base else "—"
+            json_kb = f"{stats['json_bytes'] / 1024:.0f}" if "json_bytes" in stats else ""
+            print(f"{int(size):>10,}  {name:<24}  {stats['seconds']:>9.3f}  {base_s:>9}"
+                  f"  {stats['peak_mb']:>9.1f}  {json_kb:>9}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--compact", action="store_true", help="use the compact categorical schema")
+    parser.add_argument("--store", help="load through a DatasetStore in this directory "
+                                        "(the first run builds it, later runs map it)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="runs per stage; the best is reported")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed slowdown / growth as a fraction of the baseline")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--json", help="also write the raw results here")
+    args = parser.parse_args(argv)
+
+    # Warm-up pass so imports and plotly's first-figure setup don't land in the smallest size
+    store = DatasetStore(args.store) if args.store else None
+    run_pipeline(200, args.compact, store)
+    results = {str(n): run_pipeline(n, args.compact, store, args.repeat) for n in args.sizes}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    key = ("compact" if args.compact else "default") + ("+store" if store else "")
+    print_table(results, baseline.get(key, {}))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline.setdefault(key, {}).update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline.get(key, {}), args.tolerance)
+    if regressions:
+        print("\nRegressions:")
+        for size, name, metric, old, new in regressions:
+            print(f"  {int(size):,} employees  {name}  {metric}: {old:.3f} -> {new:.3f}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
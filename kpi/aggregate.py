@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+
+from kpi.cache import LRUCache
+from kpi.filters import value_bins
+
+
+# ─────────────────────────────────────────────
+#  PER-FILTER SUMMARY — one grouped pass, LRU-cached
+# ─────────────────────────────────────────────
+SUM_COLUMNS = [
+    "Overall_KPI", "Completion_Rate", "On_Time_Rate", "Quality_Score",
+    "Productivity", "Collaboration", "Initiative",
+    "Tasks_Completed", "Tasks_Pending", "Tasks_Overdue",
+]
+
+RADAR = [
+    ("Productivity",  "Productivity"),
+    ("Completion",    "Completion_Rate"),
+    ("On-Time",       "On_Time_Rate"),
+    ("Quality",       "Quality_Score"),
+    ("Collaboration", "Collaboration"),
+    ("Initiative",    "Initiative"),
+]
+
+TASK_STATUS = [
+    ("Completed",             "Tasks_Completed"),
+    ("In Progress / Pending", "Tasks_Pending"),
+    ("Overdue",               "Tasks_Overdue"),
+]
+
+
+class Aggregator:
+    """Every reduction the page needs, from per-department sums over the selected rows."""
+
+    def __init__(self, df, maxsize=128):
+        self.dept_codes, self.departments = value_bins(df["Department"])
+        self.level_codes, self.levels = value_bins(df["Performance_Level"])
+        pending = (df["Tasks_Assigned"] - df["Tasks_Completed"] - df["Tasks_Overdue"]).clip(lower=0)
+        values = {c: df[c] for c in SUM_COLUMNS if c != "Tasks_Pending"}
+        values["Tasks_Pending"] = pending
+        # One float64 row per column, so a selection is a single gather
+        self.values = np.vstack([values[c].to_numpy(dtype=np.float64, na_value=np.nan) for c in SUM_COLUMNS])
+        # Blank optional scores (e.g. Initiative) are summed as 0 and left out
+        # of their column's counts; only columns with blanks keep a mask
+        missing = np.isnan(self.values)
+        self.filled = {i: ~missing[i] for i in np.flatnonzero(missing.any(axis=1))}
+        self.values[missing] = 0.0
+        self.col = {c: i for i, c in enumerate(SUM_COLUMNS)}
+        self.total_kpi_mean = float(df["Overall_KPI"].mean())
+        self.n = len(df)
+
+        self.cache = LRUCache(maxsize)
+
+    def _compute(self, rows):
+        subset = rows is not None and len(rows) != self.n
+        if subset:
+            dept, level, values = self.dept_codes[rows], self.level_codes[rows], self.values[:, rows]
+        else:
+            dept, level, values = self.dept_codes, self.level_codes, self.values
+
+        # One bin per department plus a last one for blank cells, kept in the totals
+        n_dept = len(self.departments) + 1
+        counts = np.bincount(dept, minlength=n_dept)
+        # Per-department sums of every column; overall totals fall out of these
+        sums = np.column_stack([np.bincount(dept, weights=v, minlength=n_dept) for v in values])
+        totals = sums.sum(axis=0)
+        n = int(counts.sum())
+        # Rows holding a value, per department and column
+        filled = np.repeat(counts[:, None].astype(np.float64), len(SUM_COLUMNS), axis=1)
+        for i, mask in self.filled.items():
+            filled[:, i] = np.bincount(dept, weights=mask[rows] if subset else mask, minlength=n_dept)
+        filled_totals = filled.sum(axis=0)
+
+        def mean(c):
+            i = self.col[c]
+            return float(totals[i] / filled_totals[i]) if filled_totals[i] else float("nan")
+
+        kpi = self.col["Overall_KPI"]
+        present = filled[:-1, kpi] > 0
+        dept_kpi = pd.DataFrame({
+            "Department":  np.asarray(self.departments, dtype=object)[present],
+            "Overall_KPI": (sums[:-1][present, kpi] / filled[:-1][present, kpi]).round(1),
+        }).sort_values("Overall_KPI", ascending=True)
+
+        level_counts = np.bincount(level, minlength=len(self.levels) + 1)[:-1]
+        perf = pd.DataFrame({"Level": self.levels, "Count": level_counts})
+        perf = perf[perf["Count"] > 0].sort_values("Count", ascending=False, kind="stable")
+
+        return {
+            "count":           n,
+            "kpi_mean":        mean("Overall_KPI"),
+            "kpi_delta":       mean("Overall_KPI") - self.total_kpi_mean,
+            "completion_mean": mean("Completion_Rate"),
+            "on_time_mean":    mean("On_Time_Rate"),
+            "quality_mean":    mean("Quality_Score"),
+            "overdue_total":   int(totals[self.col["Tasks_Overdue"]]),
+            "radar":           ([label for label, _ in RADAR], [mean(c) for _, c in RADAR]),
+            "dept_kpi":        dept_kpi.reset_index(drop=True),
+            "perf_counts":     perf.reset_index(drop=True),
+            "task_status":     pd.DataFrame({
+                "Status": [label for label, _ in TASK_STATUS],
+                "Count":  [int(totals[self.col[c]]) for _, c in TASK_STATUS],
+            }),
+        }
+
+    def summary(self, key, rows=None):
+        return self.cache.get_or_compute(key, lambda: self._compute(rows))
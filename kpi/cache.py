@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+
+
+# ─────────────────────────────────────────────
+#  THREAD-SAFE LRU — shared by every per-filter cache
+# ─────────────────────────────────────────────
+class LRUCache:
+    """Evicts least-recently-used entries past `maxsize` entries or `maxbytes` total.
+
+    `sizeof(value)` is only consulted when `maxbytes` is set.
+    """
+
+    def __init__(self, maxsize=128, maxbytes=None, sizeof=len):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.sizeof = sizeof
+        self.nbytes = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key][0]
+
+    def put(self, key, value):
+        size = self.sizeof(value) if self.maxbytes is not None else 0
+        if self.maxbytes is not None and size > self.maxbytes:
+            return value
+        with self._lock:
+            if key in self._data:
+                self.nbytes -= self._data.pop(key)[1]
+            self._data[key] = (value, size)
+            self.nbytes += size
+            while len(self._data) > self.maxsize or (
+                    self.maxbytes is not None and self.nbytes > self.maxbytes):
+                self.nbytes -= self._data.popitem(last=False)[1][1]
+        return value
+
+    def get_or_compute(self, key, compute):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = self.put(key, compute())
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.nbytes = 0
+
+
+_MISSING = object()
+
+
+# ─────────────────────────────────────────────
+#  FINISHED FIGURES — shared across sessions, bounded by serialized size
+# ─────────────────────────────────────────────
+class FigureCache:
+    """Built Plotly figures and their JSON size in bytes, evicted by total JSON size."""
+
+    def __init__(self, maxbytes=256 * 2**20, maxsize=1024):
+        self._lru = LRUCache(maxsize, maxbytes, sizeof=lambda entry: entry[1])
+
+    def __len__(self):
+        return len(self._lru)
+
+    @property
+    def nbytes(self):
+        return self._lru.nbytes
+
+    def get(self, key):
+        """(figure, nbytes), or None on a miss."""
+        return self._lru.get(key)
+
+    def put(self, key, fig):
+        # Figures are never modified once cached, so sessions can share them
+        return self._lru.put(key, (fig, len(fig.to_json().encode("utf-8"))))
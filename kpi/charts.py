@@ -0,0 +1,328 @@
+import math
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from kpi.filters import value_codes
+
+
+PERF_COLORS_MAP = {
+    "🏆 Outstanding":      "#a78bfa",
+    "⭐ Excellent":        "#34d399",
+    "✅ Good":             "#60a5fa",
+    "⚠️ Needs Improvement": "#fbbf24",
+    "🔴 Critical":         "#f87171",
+}
+DEPT_COLORS = px.colors.qualitative.Bold
+
+# Above this many rows the per-employee figures switch to server-side binning/sampling
+POINT_THRESHOLD = 20_000
+MAX_SCATTER_POINTS = 10_000
+
+
+# ─────────────────────────────────────────────
+#  ROW 1: KPI DISTRIBUTION + PERFORMANCE PIE + DEPT KPI
+# ─────────────────────────────────────────────
+def _style_histogram(fig):
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13, bargap=0.05,
+        xaxis=dict(gridcolor="#1e2235", color="#64748b"),
+        yaxis=dict(gridcolor="#1e2235", color="#64748b"),
+        legend=dict(font=dict(size=10), bgcolor="#1a1d27"),
+        margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
+def selected_columns(df, rows, columns):
+    # Only the plotted columns of the selected rows are copied, never the whole frame
+    frame = df[columns]
+    return frame if rows is None or len(rows) == len(df) else frame.take(rows)
+
+
+def binned_kpi_counts(kpi, level_codes, n_levels, nbins=20):
+    lo, hi = math.floor(np.min(kpi)), math.ceil(np.max(kpi))
+    hi = max(hi, lo + 1)
+    edges = np.linspace(lo, hi, nbins + 1)
+    bins = np.clip(((kpi - lo) / (hi - lo) * nbins).astype(np.int64), 0, nbins - 1)
+    counts = np.bincount(level_codes * nbins + bins, minlength=n_levels * nbins)
+    return edges, counts.reshape(n_levels, nbins)
+
+
+def kpi_histogram(df, rows=None, threshold=POINT_THRESHOLD, nbins=20):
+    title = "KPI Score Distribution by Performance Level"
+    filtered = selected_columns(df, rows, ["Overall_KPI", "Performance_Level"])
+    if len(filtered) <= threshold:
+        fig = px.histogram(filtered, x="Overall_KPI", nbins=nbins,
+            color="Performance_Level",
+            color_discrete_map=PERF_COLORS_MAP,
+            title=title,
+            labels={"Overall_KPI": "Overall KPI Score", "Performance_Level": "Level"})
+        return _style_histogram(fig)
+
+    codes, levels = value_codes(filtered["Performance_Level"])
+    edges, counts = binned_kpi_counts(filtered["Overall_KPI"].to_numpy(dtype=np.float64),
+                                      codes, len(levels), nbins)
+    centers, width = (edges[:-1] + edges[1:]) / 2, edges[1] - edges[0]
+    fig = go.Figure()
+    # Best level first, like the legend of the per-row figure
+    order = [levels.index(l) for l in PERF_COLORS_MAP if l in levels]
+    order += [i for i in range(len(levels)) if i not in order]
+    for i in order:
+        if counts[i].sum() == 0:
+            continue
+        fig.add_trace(go.Bar(x=centers, y=counts[i], width=width, name=levels[i],
+                             marker_color=PERF_COLORS_MAP.get(levels[i])))
+    fig.update_layout(barmode="relative", title=title,
+        xaxis_title="Overall KPI Score", yaxis_title="count", legend_title_text="Level")
+    return _style_histogram(fig)
+
+
+def performance_pie(perf_counts):
+    fig = px.pie(perf_counts, names="Level", values="Count",
+        title="Performance Breakdown", hole=0.5,
+        color="Level", color_discrete_map=PERF_COLORS_MAP)
+    fig.update_traces(textposition="outside", textfont_size=10)
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13, showlegend=False,
+        margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
+def department_kpi_bar(dept_kpi):
+    fig = px.bar(dept_kpi, x="Overall_KPI", y="Department", orientation="h",
+        title="Avg KPI by Department",
+        color="Overall_KPI", color_continuous_scale=["#f87171","#fbbf24","#34d399"],
+        text_auto=True)
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13, coloraxis_showscale=False,
+        xaxis=dict(gridcolor="#1e2235", range=[0,105]),
+        yaxis=dict(gridcolor="#1e2235"),
+        margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
+# ─────────────────────────────────────────────
+#  ROW 2: PROJECT ANALYSIS
+# ─────────────────────────────────────────────
+def project_comparison_bar(proj_filtered):
+    fig = px.bar(proj_filtered.sort_values("Avg_KPI", ascending=False),
+        x="Project", y=["Avg_KPI", "Avg_Completion", "Avg_Quality"],
+        title="Project KPI Comparison",
+        barmode="group",
+        color_discrete_sequence=["#60a5fa","#34d399","#a78bfa"],
+        labels={"value": "Score", "variable": "Metric"})
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13,
+        xaxis=dict(gridcolor="#1e2235", tickangle=-20),
+        yaxis=dict(gridcolor="#1e2235", range=[0,110]),
+        legend=dict(bgcolor="#1a1d27", font=dict(size=10)),
+        margin=dict(l=10, r=10, t=40, b=40))
+    return fig
+
+
+def project_bubble(proj_filtered):
+    fig = px.scatter(proj_filtered,
+        x="Avg_Completion", y="Avg_KPI",
+        size="Team_Size", color="Avg_Quality",
+        hover_name="Project",
+        hover_data={"Overdue_Tasks": True, "Team_Size": True},
+        title="Project Health: Completion vs KPI",
+        color_continuous_scale=["#f87171","#fbbf24","#34d399"],
+        size_max=50)
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13,
+        xaxis=dict(gridcolor="#1e2235", title="Avg Completion Rate %"),
+        yaxis=dict(gridcolor="#1e2235", title="Avg KPI Score"),
+        coloraxis_colorbar=dict(title="Quality", tickfont=dict(color="#94a3b8")),
+        margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
+# ─────────────────────────────────────────────
+#  ROW 3: TASK STATUS + MONTHLY TREND
+# ─────────────────────────────────────────────
+def task_status_pie(task_status):
+    fig = px.pie(task_status, names="Status", values="Count",
+        title="Overall Task Status", hole=0.55,
+        color="Status",
+        color_discrete_map={"Completed":"#34d399","In Progress / Pending":"#60a5fa","Overdue":"#f87171"})
+    fig.update_traces(textposition="outside", textfont_size=11)
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13,
+        legend=dict(font=dict(size=10), bgcolor="#1a1d27"),
+        margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
+def department_trend(trend_filtered):
+    fig = px.line(trend_filtered, x="Month", y="KPI_Score", color="Department",
+        markers=True, title="Monthly KPI Trend by Department",
+        color_discrete_sequence=DEPT_COLORS)
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13,
+        xaxis=dict(gridcolor="#1e2235"),
+        yaxis=dict(gridcolor="#1e2235", range=[45, 105]),
+        legend=dict(orientation="h", y=-0.25, bgcolor="#1a1d27", font=dict(size=10)),
+        margin=dict(l=10, r=10, t=40, b=40))
+    return fig
+
+
+# ─────────────────────────────────────────────
+#  ROW 4: DRILL-DOWN + RADAR
+# ─────────────────────────────────────────────
+def top_employees_bar(top, drill_metric, by_department=False):
+    hover = {"Department": True, "Primary_Project": True, "Overall_KPI": True}
+    if "Percentile" in top.columns:
+        hover["Percentile"] = ":.1f"
+    label = drill_metric.replace("_", " ")
+    if by_department:
+        # Names repeat across departments, so bars are labelled by ID too
+        top = top.assign(Employee=top["Name"].astype(str) + " · " + top["ID"].astype(str))
+        per_dept = int(top.groupby("Department", observed=True).size().max()) if len(top) else 0
+        fig = px.bar(top.sort_values(["Department", drill_metric], ascending=[False, True]),
+            x=drill_metric, y="Employee", orientation="h",
+            color="Department", color_discrete_sequence=DEPT_COLORS,
+            title=f"Top {per_dept} per Department — {label}",
+            hover_data=hover, text_auto=True)
+        fig.update_layout(height=max(360, 22 * len(top) + 80))
+    else:
+        fig = px.bar(top.sort_values(drill_metric),
+            x=drill_metric, y="Name", orientation="h",
+            color=drill_metric, color_continuous_scale=["#3b82f6","#34d399"],
+            title=f"Top {len(top)} Employees — {label}",
+            hover_data=hover,
+            text_auto=True)
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13, coloraxis_showscale=False,
+        xaxis=dict(gridcolor="#1e2235", range=[0, 110]),
+        yaxis=dict(gridcolor="#1a1d27"),
+        margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
+def performance_radar(cats, vals):
+    fig = go.Figure(go.Scatterpolar(
+        r=vals + [vals[0]], theta=cats + [cats[0]],
+        fill="toself", fillcolor="rgba(96,165,250,0.15)",
+        line=dict(color="#60a5fa", width=2),
+        marker=dict(color="#60a5fa", size=6)
+    ))
+    fig.update_layout(
+        polar=dict(bgcolor="#1a1d27",
+            radialaxis=dict(visible=True, range=[0,100], gridcolor="#2d3144", color="#64748b", tickfont=dict(size=9)),
+            angularaxis=dict(gridcolor="#2d3144", color="#94a3b8")),
+        paper_bgcolor="#1a1d27", font_color="#94a3b8",
+        title=dict(text="Avg Performance Radar", font=dict(size=13, color="#94a3b8")),
+        showlegend=False,
+        margin=dict(l=30, r=30, t=50, b=30))
+    return fig
+
+
+# ─────────────────────────────────────────────
+#  ROW 5: PRODUCTIVITY vs QUALITY SCATTER
+# ─────────────────────────────────────────────
+def _style_scatter(fig):
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13,
+        xaxis=dict(gridcolor="#1e2235", title="Productivity Score"),
+        yaxis=dict(gridcolor="#1e2235", title="Quality Score"),
+        legend=dict(bgcolor="#1a1d27", font=dict(size=10)),
+        margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
+def stratified_sample(groups, max_points, seed=0):
+    # Positions of at most max_points rows, each group kept in proportion to its size
+    n = len(groups)
+    if n <= max_points:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    order = np.lexsort((rng.random(n), groups))
+    sorted_groups = groups[order]
+    _, starts, sizes = np.unique(sorted_groups, return_index=True, return_counts=True)
+    quotas = np.maximum(1, np.floor(sizes * max_points / n).astype(np.int64))
+    picked = [order[s:s + q] for s, q in zip(starts, quotas)]
+    return np.sort(np.concatenate(picked))
+
+
+SCATTER_COLUMNS = ["Name", "Department", "Role", "Primary_Project", "Performance_Level",
+                   "Productivity", "Quality_Score", "Overall_KPI", "Tasks_Completed"]
+
+
+def productivity_quality_scatter(df, rows=None, threshold=POINT_THRESHOLD, mode="sample",
+                                 max_points=MAX_SCATTER_POINTS):
+    title = "Productivity vs Quality (size = Tasks Completed)"
+    n = len(df) if rows is None else len(rows)
+    if n <= threshold:
+        filtered = selected_columns(df, rows, SCATTER_COLUMNS)
+        fig = px.scatter(filtered, x="Productivity", y="Quality_Score",
+            color="Department", symbol="Performance_Level",
+            hover_name="Name",
+            hover_data={"Primary_Project": True, "Overall_KPI": True, "Role": True},
+            size="Tasks_Completed", size_max=18,
+            title=title,
+            color_discrete_sequence=DEPT_COLORS)
+        return _style_scatter(fig)
+
+    if mode == "density":
+        xy = selected_columns(df, rows, ["Productivity", "Quality_Score"])
+        x = xy["Productivity"].to_numpy(dtype=np.float64)
+        y = xy["Quality_Score"].to_numpy(dtype=np.float64)
+        counts, xe, ye = np.histogram2d(x, y, bins=50)
+        fig = go.Figure(go.Heatmap(
+            x=(xe[:-1] + xe[1:]) / 2, y=(ye[:-1] + ye[1:]) / 2, z=counts.T,
+            colorscale=[[0, "#0f1117"], [0.3, "#3b82f6"], [1, "#34d399"]],
+            colorbar=dict(title="Employees", tickfont=dict(color="#94a3b8")),
+            hovertemplate="Productivity %{x:.1f}<br>Quality %{y:.1f}<br>%{z} employees<extra></extra>"))
+        fig.update_layout(title=f"Productivity vs Quality — density of {n:,} employees")
+        return _style_scatter(fig)
+
+    codes, _ = value_codes(selected_columns(df, rows, ["Department"])["Department"])
+    picked = stratified_sample(codes, max_points)
+    sample = selected_columns(df, picked if rows is None else rows[picked], SCATTER_COLUMNS)
+    fig = px.scatter(sample, x="Productivity", y="Quality_Score",
+        color="Department",
+        hover_name="Name",
+        hover_data={"Primary_Project": True, "Overall_KPI": True, "Role": True},
+        title=f"Productivity vs Quality — {len(sample):,} of {n:,} employees (stratified sample)",
+        color_discrete_sequence=DEPT_COLORS,
+        render_mode="webgl")
+    fig.update_traces(marker=dict(size=4, opacity=0.6))
+    return _style_scatter(fig)
+
+
+# ─────────────────────────────────────────────
+#  ROW 6: WHAT-IF WEIGHTING
+# ─────────────────────────────────────────────
+WHATIF_COLORS = {"Current": "#475569", "What_if": "#60a5fa"}
+
+
+def whatif_levels_bar(levels):
+    fig = px.bar(levels, x="Level", y=["Current", "What_if"],
+        title="Performance Levels: Current vs What-if",
+        barmode="group",
+        color_discrete_map=WHATIF_COLORS,
+        labels={"value": "Employees", "variable": "Weighting"})
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13,
+        xaxis=dict(gridcolor="#1e2235"),
+        yaxis=dict(gridcolor="#1e2235"),
+        legend=dict(bgcolor="#1a1d27", font=dict(size=10)),
+        margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
+def whatif_project_bar(projects):
+    fig = px.bar(projects, x="Project", y=["Current", "What_if"],
+        title="Project Avg KPI: Current vs What-if (ranked by what-if)",
+        barmode="group",
+        color_discrete_map=WHATIF_COLORS,
+        labels={"value": "Avg KPI", "variable": "Weighting"})
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", title_font_size=13,
+        xaxis=dict(gridcolor="#1e2235", tickangle=-20),
+        yaxis=dict(gridcolor="#1e2235", range=[0, 105]),
+        legend=dict(bgcolor="#1a1d27", font=dict(size=10)),
+        margin=dict(l=10, r=10, t=40, b=40))
+    return fig
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from kpi.metrics import NO_PROJECT, add_derived_columns
+from kpi.rollups import SECONDARY_WEIGHT, ProjectRollup
+
+
+# ─────────────────────────────────────────────
+#  DEFAULT DIMENSIONS
+# ─────────────────────────────────────────────
+DEPARTMENTS = ["Engineering", "Marketing", "Sales", "HR", "Product", "Finance", "Operations", "Design"]
+ROLES       = ["Director", "Senior Manager", "Manager", "Senior", "Mid-Level", "Junior", "Intern"]
+PROJECTS    = [
+    "Project Alpha", "Project Beta", "Project Gamma", "Project Delta",
+    "Project Epsilon", "Project Zeta", "Project Eta", "Project Theta",
+    "Project Iota", "Project Kappa"
+]
+MONTHS      = ["Jan","Feb","Mar","Apr","May","Jun","Jul","Aug","Sep","Oct","Nov","Dec"]
+
+FIRST_NAMES = ["Aarav","Priya","Rohit","Sneha","Vikram","Anjali","Amit","Pooja","Rahul","Deepa",
+               "Karan","Nisha","Suresh","Kavya","Arjun","Meera","Nikhil","Riya","Sanjay","Divya",
+               "Aditya","Shruti","Manish","Swati","Rajesh","Komal","Varun","Neha","Sachin","Prachi",
+               "Dev","Ananya","Kunal","Simran","Tarun","Isha","Vivek","Tanya","Ashish","Pallavi",
+               "Naveen","Garima","Harsh","Ritika","Sumit","Preeti","Gaurav","Sonal","Akash","Jyoti",
+               "James","Emma","Oliver","Sophia","Liam","Ava","Noah","Isabella","William","Mia",
+               "Benjamin","Charlotte","Lucas","Amelia","Mason","Harper","Ethan","Evelyn","Alexander","Abigail",
+               "Henry","Emily","Sebastian","Elizabeth","Jacob","Sofia","Michael","Avery","Daniel","Ella",
+               "Logan","Scarlett","Jackson","Grace","Aiden","Chloe","Samuel","Victoria","David","Riley",
+               "Muhammad","Fatima","Omar","Layla","Hassan","Yasmin","Ali","Nour","Khalid","Sara"]
+
+LAST_NAMES  = ["Sharma","Patel","Gupta","Singh","Kumar","Verma","Joshi","Shah","Mehta","Nair",
+               "Smith","Johnson","Williams","Brown","Jones","Garcia","Miller","Davis","Wilson","Anderson",
+               "Taylor","Thomas","Jackson","White","Harris","Martin","Thompson","Moore","Young","Allen",
+               "Khan","Ahmed","Ali","Hassan","Hussain","Malik","Qureshi","Chaudhry","Iqbal","Sheikh",
+               "Park","Kim","Lee","Choi","Jung","Yoon","Lim","Han","Oh","Seo",
+               "Chen","Wang","Li","Liu","Zhang","Huang","Zhao","Wu","Zhou","Sun",
+               "Tanaka","Yamamoto","Suzuki","Watanabe","Ito","Sato","Kobayashi","Kato","Abe","Nakamura",
+               "Silva","Santos","Oliveira","Souza","Costa","Alves","Carvalho","Gomes","Martins","Rocha",
+               "Lopez","Martinez","Rodriguez","Hernandez","Gonzalez","Perez","Sanchez","Ramirez","Torres","Flores",
+               "Muller","Schmidt","Schneider","Fischer","Weber","Meyer","Wagner","Becker","Schulz","Hoffmann"]
+
+
+# ─────────────────────────────────────────────
+#  VECTORIZED GENERATOR
+# ─────────────────────────────────────────────
+def _names(n):
+    idx = np.arange(n)
+    nf, nl = len(FIRST_NAMES), len(LAST_NAMES)
+    # i-th first name paired with a last name that shifts every full pass,
+    # so the first nf*nl names are unique and the first 100 match the originals
+    vocab = np.array([f"{f} {l}" for f in FIRST_NAMES for l in LAST_NAMES], dtype=object)
+    return vocab[(idx % nf) * nl + (idx + idx // nf) % nl]
+
+
+def _random_walk(rng, n_series, n_steps):
+    score = rng.integers(65, 82, n_series)
+    steps = rng.integers(-5, 7, (n_steps, n_series))
+    out = np.empty((n_steps, n_series), dtype=np.int64)
+    for t in range(n_steps):
+        score = np.clip(score + steps[t], 50, 100)
+        out[t] = score
+    return out
+
+
+def project_summary(df, secondary_weight=SECONDARY_WEIGHT):
+    return ProjectRollup(df, secondary_weight).summary()
+
+
+def generate_data(n_employees=100, departments=DEPARTMENTS, projects=PROJECTS, roles=ROLES, seed=99):
+    rng = np.random.default_rng(seed)
+    n = int(n_employees)
+    departments, projects, roles = list(departments), list(projects), list(roles)
+
+    dept_idx = np.arange(n) % len(departments)
+    role_idx = rng.integers(0, len(roles), n)
+    proj_idx = rng.integers(0, len(projects), n)
+
+    # Secondary project: half of the employees, never equal to the primary one
+    has_proj2 = rng.random(n) > 0.5
+    if len(projects) > 1:
+        proj2_idx = (proj_idx + rng.integers(1, len(projects), n)) % len(projects)
+    else:
+        has_proj2[:] = False
+        proj2_idx = proj_idx
+    secondary = np.asarray(projects + [NO_PROJECT], dtype=object)[np.where(has_proj2, proj2_idx, len(projects))]
+
+    tasks_assigned  = rng.integers(15, 80, n)
+    tasks_completed = (tasks_assigned * rng.uniform(0.55, 1.0, n)).astype(np.int64)
+    tasks_overdue   = rng.integers(0, np.maximum(1, tasks_assigned - tasks_completed + 1))
+
+    # Quality, On-Time, Collaboration, Initiative, Productivity in one draw
+    lows   = np.array([50, 45, 50, 50, 50], dtype=np.float64)[:, None]
+    scores = rng.uniform(lows, 100, (5, n)).round(1)
+
+    df = pd.DataFrame({
+        "ID":                np.char.add("EMP", np.arange(1001, 1001 + n).astype(str)),
+        "Name":              _names(n),
+        "Department":        np.asarray(departments, dtype=object)[dept_idx],
+        "Role":              np.asarray(roles, dtype=object)[role_idx],
+        "Primary_Project":   np.asarray(projects, dtype=object)[proj_idx],
+        "Secondary_Project": secondary,
+        "Tasks_Assigned":    tasks_assigned,
+        "Tasks_Completed":   tasks_completed,
+        "Tasks_Overdue":     tasks_overdue,
+        "Quality_Score":     scores[0],
+        "On_Time_Rate":      scores[1],
+        "Collaboration":     scores[2],
+        "Initiative":        scores[3],
+        "Productivity":      scores[4],
+    })
+    df = add_derived_columns(df)
+
+    # Monthly trend per dept
+    walk = _random_walk(rng, len(departments), len(MONTHS))
+    trend_df = pd.DataFrame({
+        "Month":      np.tile(MONTHS, len(departments)),
+        "Department": np.repeat(departments, len(MONTHS)),
+        "KPI_Score":  walk.T.ravel(),
+    })
+
+    return df, trend_df, project_summary(df)
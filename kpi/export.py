@@ -0,0 +1,54 @@
+import gzip
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+# ─────────────────────────────────────────────
+#  CHUNKED EXPORT — written only when requested
+# ─────────────────────────────────────────────
+EXPORT_FORMATS = {
+    "csv":     {"label": "CSV",            "suffix": ".csv",     "mime": "text/csv"},
+    "csv.gz":  {"label": "CSV (gzip)",     "suffix": ".csv.gz",  "mime": "application/gzip"},
+    "parquet": {"label": "Parquet",        "suffix": ".parquet", "mime": "application/vnd.apache.parquet"},
+}
+
+EXPORT_CHUNKSIZE = 100_000
+
+
+def iter_csv_chunks(df, chunksize=EXPORT_CHUNKSIZE):
+    # Encoded CSV a slice at a time; the header goes out with the first slice only
+    for start in range(0, max(len(df), 1), chunksize):
+        part = df.iloc[start:start + chunksize]
+        yield part.to_csv(index=False, header=start == 0).encode("utf-8")
+
+
+def write_export(df, fmt, fileobj, chunksize=EXPORT_CHUNKSIZE):
+    if fmt == "csv":
+        for chunk in iter_csv_chunks(df, chunksize):
+            fileobj.write(chunk)
+    elif fmt == "csv.gz":
+        with gzip.GzipFile(fileobj=fileobj, mode="wb", compresslevel=6, mtime=0) as gz:
+            for chunk in iter_csv_chunks(df, chunksize):
+                gz.write(chunk)
+    elif fmt == "parquet":
+        schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False)
+        with pq.ParquetWriter(fileobj, schema, compression="zstd") as writer:
+            for start in range(0, len(df), chunksize):
+                part = df.iloc[start:start + chunksize]
+                writer.write_table(pa.Table.from_pandas(part, schema=schema, preserve_index=False))
+    else:
+        raise ValueError(f"Unknown export format: {fmt!r}")
+    return fileobj
+
+
+def export_bytes(df, fmt, chunksize=EXPORT_CHUNKSIZE):
+    # With no other reference to the buffer, getvalue() trims it in place and
+    # hands it over instead of copying the finished file
+    buf = write_export(df, fmt, io.BytesIO(), chunksize)
+    return buf.getvalue()
+
+
+def export_file_name(stem, fmt):
+    return stem + EXPORT_FORMATS[fmt]["suffix"]
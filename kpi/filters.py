@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+
+# ─────────────────────────────────────────────
+#  SIDEBAR FILTER INDEX — built once per dataset
+# ─────────────────────────────────────────────
+FILTER_COLUMNS = {
+    "project":    "Primary_Project",
+    "department": "Department",
+    "role":       "Role",
+    "level":      "Performance_Level",
+}
+
+
+def value_codes(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series.cat.codes.to_numpy(), list(series.cat.categories)
+    codes, uniques = pd.factorize(series, sort=True)
+    return codes, list(uniques)
+
+
+def value_bins(series):
+    # value_codes() for np.bincount: blank cells (code -1) go to an extra last
+    # bin, len(values), which callers drop from per-value results
+    codes, values = value_codes(series)
+    if (codes < 0).any():
+        codes = codes.astype(np.int64)
+        codes[codes < 0] = len(values)
+    return codes, values
+
+
+class FilterIndex:
+    """Packed per-value bitsets for the multiselects plus a sorted Overall_KPI index.
+
+    `select()` returns the matching row positions in ascending order; a
+    selection that keeps every row returns `np.arange(n)` without touching
+    any bitset.
+    """
+
+    def __init__(self, df):
+        self.n = len(df)
+        self.bitsets = {}
+        self.values = {}
+        for key, col in FILTER_COLUMNS.items():
+            codes, values = value_codes(df[col])
+            self.values[key] = values
+            self.bitsets[key] = {v: np.packbits(codes == i) for i, v in enumerate(values)}
+
+        kpi = df["Overall_KPI"].to_numpy()
+        self.kpi_order = np.argsort(kpi, kind="stable")
+        self.kpi_sorted = kpi[self.kpi_order]
+        self.kpi_rank = np.empty(self.n, dtype=np.int64)
+        self.kpi_rank[self.kpi_order] = np.arange(self.n)
+
+    def options(self, key):
+        """Values of the `key` dimension ("project", "department", ...), sorted, blanks left out."""
+        return sorted(self.values[key])
+
+    def kpi_bounds(self):
+        """Lowest and highest Overall_KPI, read off the ends of the sorted index."""
+        # NaN sorts last, so the maximum sits just before the first NaN
+        last = int(np.searchsorted(self.kpi_sorted, np.nan)) - 1
+        return self.kpi_sorted[0], self.kpi_sorted[last]
+
+    def _dimension_bits(self, key, selected):
+        values = self.values[key]
+        wanted = set(selected)
+        hits = [v for v in values if v in wanted]
+        if len(hits) == len(values):
+            return None
+        bitsets = self.bitsets[key]
+        # OR the smaller side: the chosen values, or the complement of the rest
+        if len(hits) <= len(values) - len(hits):
+            return np.bitwise_or.reduce([bitsets[v] for v in hits]) if hits else 0
+        misses = [bitsets[v] for v in values if v not in wanted]
+        return ~np.bitwise_or.reduce(misses)
+
+    def kpi_positions(self, lo, hi):
+        return (int(np.searchsorted(self.kpi_sorted, lo, side="left")),
+                int(np.searchsorted(self.kpi_sorted, hi, side="right")))
+
+    def normalize(self, project, department, role, level, kpi_range):
+        # Hashable, order-insensitive key; selections that pick the same rows
+        # (every value ticked, slider beyond the data) collapse to one key
+        key = []
+        for name, selected in (("project", project), ("department", department),
+                               ("role", role), ("level", level)):
+            values = self.values[name]
+            wanted = set(selected)
+            hits = tuple(v for v in values if v in wanted)
+            key.append("*" if len(hits) == len(values) else hits)
+        key.append(self.kpi_positions(*kpi_range))
+        return tuple(key)
+
+    def select(self, project, department, role, level, kpi_range):
+        bits = None
+        for key, selected in (("project", project), ("department", department),
+                              ("role", role), ("level", level)):
+            dim = self._dimension_bits(key, selected)
+            if dim is None:
+                continue
+            if isinstance(dim, int):
+                return np.empty(0, dtype=np.int64)
+            bits = dim if bits is None else bits & dim
+
+        lo, hi = self.kpi_positions(*kpi_range)
+        if lo >= hi:
+            return np.empty(0, dtype=np.int64)
+        full_range = lo == 0 and hi == self.n
+
+        if bits is None:
+            if full_range:
+                return np.arange(self.n)
+            return np.sort(self.kpi_order[lo:hi])
+
+        mask = np.unpackbits(bits, count=self.n).view(bool)
+        if not full_range:
+            mask &= (self.kpi_rank >= lo) & (self.kpi_rank < hi)
+        return np.flatnonzero(mask)
@@ -0,0 +1,301 @@
+"""Per-employee monthly KPI snapshots, one Parquet partition per month.
+
+    <root>/month=2024-03/employees.parquet   every employee's scores that month, sorted by ID
+    <root>/month=2024-03/rollups.parquet     additive sums per department, project and role
+
+A partition is written once, atomically, and never rewritten; appending a
+month adds a directory. Range queries open only the partitions in range, and
+rollup queries only their small rollup files.
+
+    python -m kpi.history synth DIR --employees 100000 --months 36
+    python -m kpi.history append DIR 2025-01 exports/employees_2025-01.parquet
+    python -m kpi.history rollup DIR Department --start 2024-01 --end 2024-12
+"""
+import argparse
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from kpi.metrics import add_derived_columns
+from kpi.rollups import DepartmentRollup, ProjectRollup, RoleRollup
+from kpi.sources import TREND_DTYPES, DataSource, open_source
+
+
+HISTORY_COLUMNS = [
+    "ID", "Department", "Role", "Primary_Project", "Secondary_Project",
+    "Tasks_Assigned", "Tasks_Completed", "Tasks_Overdue",
+    "Quality_Score", "On_Time_Rate", "Collaboration", "Initiative", "Productivity",
+    "Completion_Rate", "Overall_KPI",
+]
+
+ROLLUPS = {
+    "Department": DepartmentRollup,
+    "Project":    ProjectRollup,
+    "Role":       RoleRollup,
+}
+
+MONTH = re.compile(r"\d{4}-(0[1-9]|1[0-2])")
+PARTITION = re.compile(r"month=(\d{4}-\d{2})")
+ROW_GROUP_SIZE = 65_536
+
+
+def check_month(month):
+    if not isinstance(month, str) or not MONTH.fullmatch(month):
+        raise ValueError(f"Months are written YYYY-MM, got {month!r}")
+    return month
+
+
+def month_range(end, periods):
+    """The `periods` months up to and including `end`, oldest first."""
+    return pd.period_range(end=check_month(end), periods=periods, freq="M").strftime("%Y-%m").tolist()
+
+
+# ─────────────────────────────────────────────
+#  STORE
+# ─────────────────────────────────────────────
+class HistoryStore:
+    """Append-only monthly partitions plus their precomputed rollups."""
+
+    def __init__(self, root):
+        self.root = root
+        # Partitions never change once written, so their rollups are cached for good
+        self._rollups = {}
+        self._lock = threading.Lock()
+
+    def path(self, month):
+        return os.path.join(self.root, f"month={check_month(month)}")
+
+    def months(self, start=None, end=None):
+        """Stored months in [start, end], oldest first; only directory names are read."""
+        if not os.path.isdir(self.root):
+            return []
+        start = None if start is None else check_month(start)
+        end = None if end is None else check_month(end)
+        found = sorted(m.group(1) for m in map(PARTITION.fullmatch, os.listdir(self.root)) if m)
+        # YYYY-MM strings order like the months they name
+        return [m for m in found if (start is None or m >= start) and (end is None or m <= end)]
+
+    def fingerprint(self):
+        return tuple(self.months())
+
+    def append(self, month, df):
+        """Write `df` (one row per employee) as the partition for `month`."""
+        target = self.path(month)
+        if os.path.exists(target):
+            raise ValueError(f"{month} is already in the history; partitions are append-only")
+        missing = [c for c in HISTORY_COLUMNS if c not in df.columns]
+        if missing:
+            raise ValueError(f"History snapshot is missing columns: {', '.join(missing)}")
+
+        snapshot = df[HISTORY_COLUMNS].sort_values("ID", kind="stable")
+        rollups = pd.concat([
+            cls(snapshot).sums.rename_axis("Key").reset_index().assign(Dimension=name)
+            for name, cls in ROLLUPS.items()
+        ], ignore_index=True)
+        rollups["Key"] = rollups["Key"].astype(str)
+
+        os.makedirs(self.root, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f".{month}-", dir=self.root)
+        try:
+            # Sorted by ID, so row-group statistics let employee lookups skip most of a month
+            pq.write_table(pa.Table.from_pandas(snapshot, preserve_index=False),
+                           os.path.join(tmp, "employees.parquet"),
+                           row_group_size=ROW_GROUP_SIZE, compression="zstd")
+            pq.write_table(pa.Table.from_pandas(rollups, preserve_index=False),
+                           os.path.join(tmp, "rollups.parquet"))
+            os.rename(tmp, target)
+        except OSError:
+            if not os.path.exists(target):
+                raise
+            raise ValueError(f"{month} was appended concurrently") from None
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def _month_rollups(self, month):
+        sums = self._rollups.get(month)
+        if sums is None:
+            sums = pq.read_table(os.path.join(self.path(month), "rollups.parquet")).to_pandas()
+            with self._lock:
+                self._rollups[month] = sums
+        return sums
+
+    def rollup(self, dimension, start=None, end=None, keys=None, by_month=True):
+        """Rollup rows for `dimension` ("Department", "Project" or "Role") over a month range.
+
+        With `by_month` there is one row per month and key; without it the
+        range is summed first, so Avg_KPI is the mean over employee-months
+        and Team_Size counts employee-months.
+        """
+        try:
+            cls = ROLLUPS[dimension]
+        except KeyError:
+            raise ValueError(f"No rollup for {dimension!r}; choose from {', '.join(ROLLUPS)}") from None
+        parts = []
+        for month in self.months(start, end):
+            sums = self._month_rollups(month)
+            sums = sums[sums["Dimension"] == dimension].drop(columns="Dimension")
+            if keys is not None:
+                sums = sums[sums["Key"].isin(keys)]
+            parts.append(sums.assign(Month=month))
+        if not parts:
+            empty = cls._finish(pd.DataFrame(columns=["Heads", "Weight", "KPI", "Completion", "Quality",
+                                                      "Assigned", "Completed", "Overdue"], dtype=float))
+            empty = empty.reset_index()
+            if by_month:
+                empty.insert(0, "Month", pd.Series(dtype=str))
+            return empty
+        sums = pd.concat(parts, ignore_index=True)
+        if not by_month:
+            return cls._finish(sums.drop(columns="Month").groupby("Key").sum()).reset_index()
+        out = cls._finish(sums.set_index("Key").drop(columns="Month")).reset_index()
+        out.insert(0, "Month", sums["Month"].to_numpy())
+        return out
+
+    def trend(self, start=None, end=None, departments=None):
+        """Monthly average KPI per department, shaped like the dashboard's trend_df."""
+        rows = self.rollup("Department", start, end, keys=departments)
+        trend_df = rows[["Month", "Department"]].assign(KPI_Score=rows["Avg_KPI"])
+        return trend_df.astype(TREND_DTYPES).reset_index(drop=True)
+
+    def snapshot(self, month, columns=None):
+        return pq.read_table(os.path.join(self.path(month), "employees.parquet"), columns=columns).to_pandas()
+
+    def employee_history(self, ids, start=None, end=None, columns=None):
+        """Monthly rows of the given employees; row groups whose ID range misses them are skipped."""
+        ids = [str(i) for i in ids]
+        if columns is not None:
+            columns = list(dict.fromkeys(["ID", *columns]))
+        parts = []
+        for month in self.months(start, end):
+            table = pq.read_table(os.path.join(self.path(month), "employees.parquet"),
+                                  columns=columns, filters=[("ID", "in", ids)])
+            parts.append(table.to_pandas().assign(Month=month))
+        if not parts:
+            return pd.DataFrame(columns=["Month", *(columns or HISTORY_COLUMNS)])
+        out = pd.concat(parts, ignore_index=True)
+        return out[["Month", *[c for c in out.columns if c != "Month"]]]
+
+
+def history_from_env():
+    root = os.environ.get("KPI_HISTORY_DIR")
+    return HistoryStore(root) if root else None
+
+
+# ─────────────────────────────────────────────
+#  SOURCE WRAPPER — the dashboard's trend read from the history
+# ─────────────────────────────────────────────
+class HistorySource(DataSource):
+    """`source` with its monthly trend replaced by the last `months` months of a HistoryStore."""
+
+    def __init__(self, source, history, months=None):
+        self.source = source
+        self.history = history
+        self.months = months
+
+    def fingerprint(self):
+        # A newly appended month counts as a new version
+        return (self.source.fingerprint(), self.history.root, self.history.fingerprint(), self.months)
+
+    def iter_chunks(self, compact=False):
+        return self.source.iter_chunks(compact)
+
+    def attach(self, tables):
+        self.source.attach(tables)
+
+    def load_trend(self):
+        stored = self.history.months()
+        start = stored[-self.months:][0] if self.months and stored else None
+        return self.history.trend(start=start)
+
+    def load(self, compact=False):
+        df, _, proj_df = self.source.load(compact)
+        return df, self.load_trend(), proj_df
+
+
+# ─────────────────────────────────────────────
+#  SYNTHETIC HISTORY
+# ─────────────────────────────────────────────
+DRIFTING = ["Quality_Score", "On_Time_Rate", "Collaboration", "Initiative", "Productivity"]
+
+
+def synthetic_history(df, months, seed=7):
+    """Yield (month, snapshot) for `months`, newest first, starting from `df` itself.
+
+    Each earlier month walks every score back by a per-department drift plus
+    per-employee noise, so department trends move the way they would in real
+    exports. Only one month is held in memory at a time.
+    """
+    rng = np.random.default_rng(seed)
+    dept_codes, departments = pd.factorize(df["Department"])
+    snapshot = df[HISTORY_COLUMNS]
+    for i, month in enumerate(reversed(months)):
+        if i:
+            snapshot = snapshot.copy()
+            drift = rng.normal(0, 1.5, len(departments))[dept_codes]
+            for col in DRIFTING:
+                noise = rng.normal(0, 2.0, len(snapshot))
+                values = snapshot[col].to_numpy(dtype=np.float64) - drift + noise
+                snapshot[col] = np.clip(values, 0, 100).round(1)
+            snapshot = add_derived_columns(snapshot)[HISTORY_COLUMNS]
+        yield month, snapshot
+
+
+# ─────────────────────────────────────────────
+#  CLI
+# ─────────────────────────────────────────────
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    synth = commands.add_parser("synth", help="fill a new history with synthetic months")
+    synth.add_argument("root")
+    synth.add_argument("--employees", type=int, default=100_000)
+    synth.add_argument("--months", type=int, default=24)
+    synth.add_argument("--end", type=check_month, default=pd.Timestamp.today().strftime("%Y-%m"))
+    synth.add_argument("--seed", type=int, default=99)
+
+    append = commands.add_parser("append", help="append one month from an employee export")
+    append.add_argument("root")
+    append.add_argument("month")
+    append.add_argument("source", help="CSV/Parquet export, export directory, or synthetic://<n>")
+
+    rollup = commands.add_parser("rollup", help="print a rollup over a month range")
+    rollup.add_argument("root")
+    rollup.add_argument("dimension", choices=list(ROLLUPS))
+    rollup.add_argument("--start", type=check_month)
+    rollup.add_argument("--end", type=check_month)
+    rollup.add_argument("--total", action="store_true", help="one row per key for the whole range")
+
+    commands.add_parser("months", help="list stored months").add_argument("root")
+
+    args = parser.parse_args(argv)
+    store = HistoryStore(args.root)
+
+    if args.command == "synth":
+        from kpi.data import generate_data
+        df = generate_data(args.employees, seed=args.seed)[0]
+        for month, snapshot in synthetic_history(df, month_range(args.end, args.months), seed=args.seed):
+            if month not in store.months(month, month):
+                store.append(month, snapshot)
+        print(f"{len(store.months())} months in {args.root}")
+    elif args.command == "append":
+        store.append(check_month(args.month), open_source(args.source).load_rows())
+        print(f"Appended {args.month}; {len(store.months())} months in {args.root}")
+    elif args.command == "rollup":
+        out = store.rollup(args.dimension, args.start, args.end, by_month=not args.total)
+        print(out.to_string(index=False))
+    else:
+        print("\n".join(store.months()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
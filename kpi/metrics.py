@@ -0,0 +1,48 @@
+import numpy as np
+
+
+# ─────────────────────────────────────────────
+#  KPI FORMULA + PERFORMANCE LEVELS
+# ─────────────────────────────────────────────
+KPI_WEIGHTS = {
+    "Productivity":    0.25,
+    "Completion_Rate": 0.25,
+    "On_Time_Rate":    0.20,
+    "Quality_Score":   0.20,
+    "Collaboration":   0.10,
+}
+
+NO_PROJECT = "—"
+
+# Lower bound of every level except the first, ascending
+LEVEL_THRESHOLDS = [55, 68, 78, 88]
+PERF_LEVELS = [
+    "🔴 Critical",
+    "⚠️ Needs Improvement",
+    "✅ Good",
+    "⭐ Excellent",
+    "🏆 Outstanding",
+]
+
+
+def level_codes(kpi):
+    # One compare per threshold beats a binary search per value
+    kpi = np.asarray(kpi)
+    codes = np.zeros(kpi.shape, dtype=np.int8)
+    for threshold in LEVEL_THRESHOLDS:
+        codes += kpi >= threshold
+    return codes
+
+
+def assign_levels(kpi):
+    return np.asarray(PERF_LEVELS, dtype=object)[level_codes(kpi)]
+
+
+def add_derived_columns(df):
+    df["Completion_Rate"] = (df["Tasks_Completed"] / df["Tasks_Assigned"] * 100).round(1)
+    kpi = 0.0
+    for col, w in KPI_WEIGHTS.items():
+        kpi = kpi + df[col] * w
+    df["Overall_KPI"] = kpi.round(1)
+    df["Performance_Level"] = assign_levels(df["Overall_KPI"].to_numpy())
+    return df
@@ -0,0 +1,130 @@
+"""The dashboard's data path as plain functions, usable without a Streamlit server."""
+import math
+
+from kpi import charts
+from kpi.aggregate import Aggregator
+from kpi.filters import FilterIndex
+from kpi.ranking import RANK_METRICS, SortIndex
+from kpi.sections import DEFAULT_INPUTS, filter_inputs, section_key
+from kpi.sources import open_source
+from kpi.store import dataset_digest
+from kpi.table import SHOW_COLS, table_page
+from kpi.weights import WeightEngine
+
+
+DRILL_COLUMNS = ["ID", "Name", "Department", "Primary_Project"]
+
+
+# ─────────────────────────────────────────────
+#  DATA + INDEXES
+# ─────────────────────────────────────────────
+def store_digest(fingerprint, compact=False):
+    return dataset_digest(fingerprint, bool(compact))
+
+
+def load_source(source, compact=False, store=None, fingerprint=None):
+    # With a DatasetStore the prepared tables are built once per source version
+    # and then memory-mapped from disk by every caller
+    if store is None:
+        return source.load(compact=compact)
+    fingerprint = source.fingerprint() if fingerprint is None else fingerprint
+    tables = store.load_or_build(store_digest(fingerprint, compact),
+                                 lambda: source.load(compact=compact),
+                                 meta={"fingerprint": repr(fingerprint), "compact": bool(compact)})
+    source.attach(tables)
+    return tables
+
+
+def load_dataset(uri="synthetic://100", compact=False, store=None, **kwargs):
+    return load_source(open_source(uri, **kwargs), compact, store)
+
+
+def build_indexes(df):
+    return {
+        "filter_index": FilterIndex(df),
+        "aggregator":   Aggregator(df),
+        "sort_index":   SortIndex(df, presort=RANK_METRICS),
+        "weights":      WeightEngine(df),
+    }
+
+
+def default_filters(df, filter_index=None):
+    # Sidebar state before the user touches anything. A built FilterIndex
+    # already holds the options and the KPI range, so nothing scans df.
+    if filter_index is not None:
+        lo, hi = filter_index.kpi_bounds()
+        options = {key: filter_index.options(key) for key in ("project", "department", "role")}
+    else:
+        lo, hi = df["Overall_KPI"].min(), df["Overall_KPI"].max()
+        options = {key: sorted(df[col].unique().tolist())
+                   for key, col in (("project", "Primary_Project"), ("department", "Department"),
+                                    ("role", "Role"))}
+    return dict(options, level=list(charts.PERF_COLORS_MAP), kpi_range=(math.floor(lo), math.ceil(hi)))
+
+
+# ─────────────────────────────────────────────
+#  PER-RERUN STAGES
+# ─────────────────────────────────────────────
+def apply_filters(filter_index, filters):
+    # Row positions only; charts gather the few columns they plot themselves
+    return filter_index.select(**filters), filter_index.normalize(**filters)
+
+
+def project_view(proj_df, projects):
+    return proj_df[proj_df["Project"].isin(projects)]
+
+
+def trend_view(trend_df, departments):
+    return trend_df[trend_df["Department"].isin(departments)]
+
+
+def top_employees(df, sort_index, rows, metric, n=10, per_department=False):
+    # Walks the presorted order of `metric` over the selection; nothing is sorted here
+    if per_department:
+        positions = sort_index.top_by_group(rows, metric, "Department", n)
+    else:
+        positions = sort_index.ordered(rows, metric, ascending=False, stop=n)
+    top = df.iloc[positions][list(dict.fromkeys(DRILL_COLUMNS + [metric, "Overall_KPI"]))]
+    top = top.reset_index(drop=True)
+    top["Percentile"] = sort_index.percentile(rows, metric, positions).round(1)
+    return top
+
+
+def build_figures(df, rows, summary, proj_filtered, trend_filtered, top, drill_metric="Overall_KPI",
+                  threshold=charts.POINT_THRESHOLD, pq_mode="sample", per_department=False):
+    cats, vals = summary["radar"]
+    return {
+        "kpi_histogram":   charts.kpi_histogram(df, rows, threshold=threshold),
+        "performance_pie": charts.performance_pie(summary["perf_counts"]),
+        "department_kpi":  charts.department_kpi_bar(summary["dept_kpi"]),
+        "project_kpi":     charts.project_comparison_bar(proj_filtered),
+        "project_bubble":  charts.project_bubble(proj_filtered),
+        "task_status":     charts.task_status_pie(summary["task_status"]),
+        "department_trend": charts.department_trend(trend_filtered),
+        "top_employees":   charts.top_employees_bar(top, drill_metric, by_department=per_department),
+        "radar":           charts.performance_radar(cats, vals),
+        "productivity_quality": charts.productivity_quality_scatter(df, rows, threshold=threshold, mode=pq_mode),
+    }
+
+
+def employee_page(df, sort_index, rows, **kwargs):
+    return table_page(df, sort_index, rows, columns=SHOW_COLS, **kwargs)
+
+
+def prewarm_figures(figure_cache, key_prefix, df, trend_df, proj_df, indexes,
+                    threshold=charts.POINT_THRESHOLD):
+    """Build and cache every figure for the untouched sidebar state, under the keys the app looks up."""
+    filters = default_filters(df, indexes["filter_index"])
+    rows, filter_key = apply_filters(indexes["filter_index"], filters)
+    summary = indexes["aggregator"].summary(filter_key, rows)
+    top = top_employees(df, indexes["sort_index"], rows, DEFAULT_INPUTS["drill_metric"],
+                        DEFAULT_INPUTS["top_n"], DEFAULT_INPUTS["per_department"])
+    figures = build_figures(df, rows, summary,
+                            project_view(proj_df, filters["project"]),
+                            trend_view(trend_df, filters["department"]), top,
+                            threshold=threshold, drill_metric=DEFAULT_INPUTS["drill_metric"],
+                            pq_mode=DEFAULT_INPUTS["pq_mode"], per_department=DEFAULT_INPUTS["per_department"])
+    inputs = dict(filter_inputs(filter_key), **DEFAULT_INPUTS)
+    for chart_id, fig in figures.items():
+        figure_cache.put(key_prefix + section_key(chart_id, inputs), fig)
+    return len(figures)
@@ -0,0 +1,166 @@
+"""Opt-in per-rerun stage timings, chart payload sizes and a JSONL log for latency percentiles.
+
+    python -m kpi.profiling profile.jsonl        # p50 / p95 per stage across logged reruns
+"""
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+
+TRUTHY = {"1", "true", "yes", "on"}
+_NULL_STAGE = contextlib.nullcontext()
+_LOG_LOCK = threading.Lock()
+
+
+def profiling_requested(query_value=None, env=os.environ):
+    # ?profile=1 or KPI_PROFILE=1
+    values = (query_value, env.get("KPI_PROFILE"))
+    return any(str(v).strip().lower() in TRUTHY for v in values if v is not None)
+
+
+# ─────────────────────────────────────────────
+#  PER-RERUN RECORDER
+# ─────────────────────────────────────────────
+class Profiler:
+    """Wall-clock stages of one script run; a no-op unless enabled.
+
+    `section(name)` runs until the next section (or `finish()`), so a script can be
+    split into top-level sections without re-indenting it; `stage(name)` is a
+    context manager nested inside the current section.
+    """
+
+    def __init__(self, enabled=False, log_path=None, session_id=None, scope="app"):
+        self.enabled = enabled
+        self.log_path = log_path
+        self.session_id = session_id
+        self.scope = scope
+        self.finished = False
+        self.stages = []
+        self.payloads = {}
+        self._section = None
+        self._depth = 0
+        self._t0 = time.perf_counter()
+
+    def restart(self, scope):
+        """A fresh recorder with the same settings, for a partial (fragment) rerun."""
+        return Profiler(self.enabled, self.log_path, self.session_id, scope)
+
+    def _now(self):
+        return time.perf_counter() - self._t0
+
+    def _open(self, name, depth):
+        record = {"name": name, "depth": depth, "start": self._now()}
+        self.stages.append(record)
+        return record
+
+    def _close(self, record):
+        record["seconds"] = self._now() - record["start"]
+
+    def section(self, name):
+        if not self.enabled:
+            return
+        if self._section is not None:
+            self._close(self._section)
+        self._section = self._open(name, 0)
+
+    def stage(self, name):
+        if not self.enabled:
+            return _NULL_STAGE
+        return self._timed(name)
+
+    @contextlib.contextmanager
+    def _timed(self, name):
+        record = self._open(name, self._depth + (self._section is not None))
+        self._depth += 1
+        try:
+            yield record
+        finally:
+            self._depth -= 1
+            self._close(record)
+
+    def payload(self, name, nbytes):
+        if self.enabled:
+            self.payloads[name] = int(nbytes)
+
+    def finish(self):
+        """The rerun as one record, appended to the JSONL log when one is configured."""
+        if not self.enabled or self.finished:
+            return None
+        self.finished = True
+        if self._section is not None:
+            self._close(self._section)
+            self._section = None
+        record = {
+            "ts": time.time(),
+            "session": self.session_id,
+            "scope": self.scope,
+            "total_seconds": time.perf_counter() - self._t0,
+            "stages": [s for s in self.stages if "seconds" in s],
+            "payload_bytes": self.payloads,
+        }
+        if self.log_path:
+            line = json.dumps(record) + "\n"
+            with _LOG_LOCK, open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(line)
+        return record
+
+
+# ─────────────────────────────────────────────
+#  WATERFALL + PERCENTILES
+# ─────────────────────────────────────────────
+def waterfall_figure(record):
+    stages = record["stages"]
+    labels = ["  " * s["depth"] + s["name"] for s in stages]
+    fig = go.Figure(go.Bar(
+        y=labels, x=[s["seconds"] * 1000 for s in stages],
+        base=[s["start"] * 1000 for s in stages], orientation="h",
+        marker_color=["#60a5fa" if s["depth"] == 0 else "#a78bfa" for s in stages],
+        hovertemplate="%{y}<br>%{x:.1f} ms<extra></extra>"))
+    fig.update_layout(plot_bgcolor="#0f1117", paper_bgcolor="#1a1d27",
+        font_color="#94a3b8", font_size=10, showlegend=False,
+        title=f"Rerun {record['total_seconds'] * 1000:.0f} ms", title_font_size=12,
+        xaxis=dict(title="ms", gridcolor="#1e2235", color="#64748b"),
+        yaxis=dict(autorange="reversed", color="#94a3b8"),
+        height=max(220, 18 * len(stages) + 80),
+        margin=dict(l=10, r=10, t=40, b=10))
+    return fig
+
+
+def read_log(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def latency_percentiles(records, percentiles=(50, 95)):
+    """p50/p95 in ms per top-level stage and per rerun scope ("(app)" for full reruns), across records."""
+    samples = {}
+    for r in records:
+        samples.setdefault(f"({r.get('scope', 'app')})", []).append(r["total_seconds"])
+    for r in records:
+        for s in r["stages"]:
+            if s["depth"] == 0:
+                samples.setdefault(s["name"], []).append(s["seconds"])
+    rows = {name: [len(v)] + list(np.percentile(np.asarray(v) * 1000, percentiles))
+            for name, v in samples.items()}
+    return pd.DataFrame.from_dict(rows, orient="index",
+                                  columns=["reruns"] + [f"p{p}_ms" for p in percentiles])
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print(__doc__.strip().splitlines()[-1].strip())
+        return 2
+    print(latency_percentiles(read_log(argv[0])).round(1).to_string())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
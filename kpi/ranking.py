@@ -0,0 +1,134 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from kpi.filters import value_codes
+
+
+# ─────────────────────────────────────────────
+#  PRESORTED ORDERS — one argsort per column and direction, per dataset
+# ─────────────────────────────────────────────
+WALK_BLOCK = 65_536
+
+# Drill-down metrics, presorted best-first when a dataset version is built
+RANK_METRICS = ["Overall_KPI", "Completion_Rate", "On_Time_Rate", "Quality_Score", "Productivity"]
+
+
+def _sort_keys(series):
+    if isinstance(series.dtype, pd.CategoricalDtype) and not series.cat.ordered:
+        series = series.astype(str)
+    if series.dtype.kind in "biuf":
+        return series.to_numpy(dtype=np.float64)
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy().astype(np.float64)
+    else:
+        codes = pd.factorize(series, sort=True)[0].astype(np.float64)
+    codes[codes < 0] = np.nan
+    return codes
+
+
+class SortIndex:
+    """Stable row orders per (column, direction), built on first use and then reused.
+
+    `presort` columns get their descending order up front, so Top-N and
+    percentile queries on them never sort on the request path.
+    """
+
+    def __init__(self, df, presort=()):
+        self.df = df
+        self.n = len(df)
+        self._orders = {}
+        self._sorted = {}
+        self._groups = {}
+        self._lock = threading.Lock()
+        for column in presort:
+            self._sorted_keys(column)
+
+    def order(self, column, ascending=True):
+        key = (column, bool(ascending))
+        order = self._orders.get(key)
+        if order is None:
+            keys = _sort_keys(self.df[column])
+            # NaN sorts last in both directions
+            order = np.argsort(keys if ascending else -keys, kind="stable")
+            with self._lock:
+                self._orders[key] = order
+        return order
+
+    def _sorted_keys(self, column):
+        # Best-first values of a numeric column, NaN last
+        keys = self._sorted.get(column)
+        if keys is None:
+            keys = _sort_keys(self.df[column])[self.order(column, ascending=False)]
+            with self._lock:
+                self._sorted[column] = keys
+        return keys
+
+    def _selected(self, rows):
+        if rows is None or len(rows) == self.n:
+            return None
+        selected = np.zeros(self.n, dtype=bool)
+        selected[rows] = True
+        return selected
+
+    def ordered(self, rows, column, ascending=True, stop=None):
+        """Selected row positions in sort order, walking the presorted order up to `stop` hits."""
+        order = self.order(column, ascending)
+        stop = self.n if stop is None else stop
+        if rows is None or len(rows) == self.n:
+            return order[:stop]
+        if len(rows) == 0 or stop <= 0:
+            return order[:0]
+        selected = self._selected(rows)
+        hits, found = [], 0
+        for start in range(0, self.n, WALK_BLOCK):
+            block = order[start:start + WALK_BLOCK]
+            hit = block[selected[block]]
+            hits.append(hit)
+            found += len(hit)
+            if found >= stop:
+                break
+        return np.concatenate(hits)[:stop]
+
+    def top_by_group(self, rows, column, group_column, n, ascending=False):
+        """The first `n` selected rows of every `group_column` value, walking the order once.
+
+        Positions come back grouped by value (in code order), each group in sort order.
+        """
+        order = self.order(column, ascending)
+        if group_column not in self._groups:
+            self._groups[group_column] = value_codes(self.df[group_column])[0]
+        codes = self._groups[group_column]
+        selected = self._selected(rows)
+        n_groups = int(codes.max()) + 1 if self.n else 0
+        wanted = codes if selected is None else codes[rows]
+        need = np.where(np.bincount(wanted[wanted >= 0], minlength=n_groups) > 0, n, 0)
+        hits = [[] for _ in range(n_groups)]
+        # Stops as soon as every group in the selection has its `n`
+        for start in range(0, self.n, WALK_BLOCK):
+            if not need.any():
+                break
+            block = order[start:start + WALK_BLOCK]
+            if selected is not None:
+                block = block[selected[block]]
+            block_codes = codes[block]
+            for g in np.flatnonzero(need):
+                hit = block[block_codes == g][:need[g]]
+                hits[g].append(hit)
+                need[g] -= len(hit)
+        return np.concatenate([h for group in hits for h in group] or [order[:0]])
+
+    def percentile(self, rows, column, positions):
+        """% of selected rows scoring at or below each of `positions`, for a numeric `column`."""
+        desc = self._sorted_keys(column)
+        selected = self._selected(rows)
+        if selected is not None:
+            desc = desc[selected[self.order(column, ascending=False)]]
+        keys = _sort_keys(self.df[column].iloc[positions])
+        total = int(np.count_nonzero(~np.isnan(desc)))
+        if total == 0:
+            return np.full(len(keys), np.nan)
+        # Best-first without NaN, negated into ascending order for searchsorted
+        above = np.searchsorted(-desc[:total], -keys, side="left")
+        return (total - above) / total * 100
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+
+from kpi.pipeline import build_indexes, load_source, store_digest
+
+
+log = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────────────
+#  DATASET VERSIONS — rebuilt off the request path, swapped in whole
+# ─────────────────────────────────────────────
+class Snapshot:
+    """One immutable version of the (df, trend_df, proj_df) triple."""
+
+    def __init__(self, version, fingerprint, tables, built_seconds=0.0, digest=None):
+        self.version = version
+        self.fingerprint = fingerprint
+        # The DatasetStore entry the tables are mapped from, if any
+        self.digest = digest
+        self.tables = tables
+        self.indexes = build_indexes(tables[0])
+        self.loaded_at = time.time()
+        self.built_seconds = built_seconds
+
+    @property
+    def age_seconds(self):
+        return time.time() - self.loaded_at
+
+
+def format_age(seconds):
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f}m"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
+
+
+class Refresher:
+    """Polls a DataSource for changes and rebuilds it in a background thread.
+
+    Readers take `current` once per rerun and keep that snapshot; a rebuild
+    replaces the reference only when the new version is complete, so nobody
+    waits on it and nobody sees a half-built dataset.
+    """
+
+    def __init__(self, source, compact=False, store=None, interval=60.0, prepare=None):
+        self.source = source
+        self.compact = compact
+        self.store = store
+        self.interval = interval
+        # prepare(snapshot) runs before a version goes live, e.g. to prewarm caches
+        self.prepare = prepare
+        self.last_checked = None
+        self.last_error = None
+        self._current = None
+        self._failed = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def current(self):
+        return self._current
+
+    def _build(self, fingerprint):
+        t0 = time.perf_counter()
+        tables = load_source(self.source, self.compact, self.store, fingerprint)
+        version = 1 if self._current is None else self._current.version + 1
+        digest = store_digest(fingerprint, self.compact) if self.store is not None else None
+        snapshot = Snapshot(version, fingerprint, tables, digest=digest)
+        if self.prepare is not None:
+            try:
+                self.prepare(snapshot)
+            except Exception:
+                # A cold cache is no reason to hold back new data
+                log.exception("preparing dataset v%d failed", version)
+        snapshot.built_seconds = time.perf_counter() - t0
+        return snapshot
+
+    def check(self):
+        """Rebuild if the source changed since the current version; True when a new version went live."""
+        with self._lock:
+            fingerprint = self.source.fingerprint()
+            self.last_checked = time.time()
+            if self._current is not None and fingerprint == self._current.fingerprint:
+                # Back to the live version, e.g. a broken file was removed again
+                self._failed = self.last_error = None
+                return False
+            if fingerprint == self._failed:
+                return False
+            try:
+                snapshot = self._build(fingerprint)
+            except Exception as exc:
+                # Not retried until the source changes again
+                self._failed, self.last_error = fingerprint, exc
+                raise
+            previous = self._current
+            self._current, self._failed, self.last_error = snapshot, None, None
+            if previous is not None and previous.digest not in (None, snapshot.digest):
+                # Superseded; sessions still on it keep their mapped pages
+                self.store.remove(previous.digest)
+            return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if self.check():
+                    log.info("dataset v%d live (built in %.1fs)",
+                             self._current.version, self._current.built_seconds)
+            except Exception:
+                # Keep serving the last good version
+                log.exception("dataset refresh failed")
+
+    def start(self):
+        # The first version is built before returning; later ones in the background
+        if self._current is None:
+            self.check()
+        if self.interval and self.interval > 0 and self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="kpi-refresh", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,288 @@
+"""Headless KPI packs, one per department and per project, built in parallel without Streamlit.
+
+    python -m kpi.reports out/                                     # every department and project
+    python -m kpi.reports out/ --source exports/ --workers 4 --formats html csv png
+    python -m kpi.reports out/ --only department --store /var/cache/kpi
+
+Each pack has the dashboard's summary cards, charts and tables. It is written
+as report.html, as CSVs of the summary, employee and project tables, and as
+PNG charts when kaleido is installed. The dataset is loaded once into a
+DatasetStore, and every worker memory-maps that copy instead of loading the
+source again.
+"""
+import argparse
+import html
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from kpi import charts
+from kpi.aggregate import Aggregator
+from kpi.export import write_export
+from kpi.filters import FilterIndex
+from kpi.history import HistorySource, HistoryStore, history_from_env
+from kpi.pipeline import (apply_filters, build_figures, default_filters, load_source,
+                          project_view, store_digest, top_employees, trend_view)
+from kpi.ranking import SortIndex
+from kpi.sources import open_source, source_from_env
+from kpi.store import DatasetStore
+from kpi.table import SHOW_COLS
+
+
+REPORT_FORMATS = ("html", "csv", "png")
+TABLE_ROWS = 50
+
+# Same cards, in the same order, as the dashboard's summary row
+CARDS = [
+    ("👥 Employees",      "count",           "{:,}"),
+    ("🎯 Avg KPI Score",  "kpi_mean",        "{:.1f}"),
+    ("✅ Avg Completion", "completion_mean", "{:.1f}%"),
+    ("⏰ Avg On-Time",    "on_time_mean",    "{:.1f}%"),
+    ("⭐ Avg Quality",    "quality_mean",    "{:.1f}"),
+    ("🔴 Total Overdue",  "overdue_total",   "{:,}"),
+]
+
+# Chart ids from build_figures, two per row like the dashboard
+CHART_ROWS = [
+    ("kpi_histogram", "performance_pie"),
+    ("department_kpi", "task_status"),
+    ("project_kpi", "project_bubble"),
+    ("department_trend", "radar"),
+    ("top_employees", "productivity_quality"),
+]
+
+STYLE = """
+body { background:#0f1117; color:#94a3b8; font-family:Inter,Segoe UI,sans-serif; margin:24px; }
+h1 { color:#f1f5f9; font-size:26px; margin-bottom:2px; } h1 span { color:#60a5fa; }
+.sub { color:#64748b; font-size:13px; margin-bottom:20px; }
+.cards { display:grid; grid-template-columns:repeat(6,1fr); gap:12px; }
+.card { background:linear-gradient(135deg,#1a1d27,#1e2235); border:1px solid #2d3144; border-radius:12px; padding:14px; }
+.card .label { font-size:12px; } .card .value { color:#60a5fa; font-size:22px; font-weight:700; }
+.hdr { font-size:10px; font-weight:700; letter-spacing:.2em; text-transform:uppercase; color:#475569;
+       margin:28px 0 12px; padding-bottom:8px; border-bottom:1px solid #1e2235; }
+.row { display:grid; grid-template-columns:1fr 1fr; gap:12px; margin-bottom:12px; }
+table { border-collapse:collapse; width:100%; font-size:12px; }
+th, td { padding:4px 8px; border-bottom:1px solid #1e2235; text-align:left; } th { color:#f1f5f9; }
+a { color:#60a5fa; }
+"""
+
+
+def slug(name):
+    return re.sub(r"[^A-Za-z0-9]+", "-", str(name)).strip("-").lower() or "all"
+
+
+def report_slices(df, only=None):
+    """(kind, name, filters) for every department and every project in `df`."""
+    base = default_filters(df)
+    slices = []
+    if only in (None, "department"):
+        slices += [("department", d, dict(base, department=[d])) for d in base["department"]]
+    if only in (None, "project"):
+        slices += [("project", p, dict(base, project=[p])) for p in base["project"]]
+    return slices
+
+
+def _kaleido():
+    try:
+        import kaleido  # noqa: F401
+    except ImportError as exc:
+        raise ImportError("PNG charts require kaleido: pip install kaleido") from exc
+
+
+# ─────────────────────────────────────────────
+#  WORKERS — each maps the stored dataset once and builds its own indexes
+# ─────────────────────────────────────────────
+_WORKER = {}
+
+
+def _init_worker(store_root, digest, threshold):
+    df, trend_df, proj_df = DatasetStore(store_root).open(digest)
+    _WORKER.update(
+        tables=(df, trend_df, proj_df),
+        filter_index=FilterIndex(df),
+        aggregator=Aggregator(df),
+        sort_index=SortIndex(df),
+        threshold=threshold,
+    )
+
+
+def _cards(summary):
+    return pd.DataFrame({
+        "Metric": [label for label, _, _ in CARDS],
+        "Value":  pd.array([round(summary[key], 1) for _, key, _ in CARDS], dtype=object),
+    })
+
+
+def _report_html(kind, name, summary, figures, employees, projects, n_total, plotlyjs):
+    title = f"{kind.title()}: {name}"
+    cards = "".join(
+        f'<div class="card"><div class="label">{label}</div>'
+        f'<div class="value">{fmt.format(summary[key])}</div></div>'
+        for label, key, fmt in CARDS)
+    rows = "".join(
+        '<div class="row">' + "".join(
+            f"<div>{figures[chart_id].to_html(full_html=False, include_plotlyjs=False)}</div>"
+            for chart_id in pair) + "</div>"
+        for pair in CHART_ROWS)
+    src = (f"https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js" if plotlyjs == "cdn"
+           else "../../plotly.min.js")
+    return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>KPI report · {html.escape(title)}</title>
+<script src="{src}"></script><style>{STYLE}</style></head><body>
+<h1>📊 {html.escape(title)} <span>KPI Report</span></h1>
+<div class="sub">{summary['count']:,} of {n_total:,} employees · generated {time.strftime('%Y-%m-%d %H:%M')}</div>
+<div class="hdr">📈 Summary KPIs</div><div class="cards">{cards}</div>
+<div class="hdr">📊 Charts</div>{rows}
+<div class="hdr">📋 Project Summary</div>{projects.to_html(index=False, border=0)}
+<div class="hdr">👤 Top {len(employees)} Employees by KPI</div>{employees.to_html(index=False, border=0)}
+</body></html>
+"""
+
+
+def _build_report(kind, name, filters, out_dir, formats, table_rows, plotlyjs):
+    df, trend_df, proj_df = _WORKER["tables"]
+    rows, key = apply_filters(_WORKER["filter_index"], filters)
+    summary = _WORKER["aggregator"].summary(key, rows)
+    result = {"kind": kind, "name": name, "employees": summary["count"],
+              "avg_kpi": round(summary["kpi_mean"], 1), "path": None}
+    if summary["count"] == 0:
+        return result
+
+    sort_index = _WORKER["sort_index"]
+    proj_filtered = project_view(proj_df, filters["project"])
+    figures = build_figures(df, rows, summary, proj_filtered, trend_view(trend_df, filters["department"]),
+                            top_employees(df, sort_index, rows, "Overall_KPI"),
+                            threshold=_WORKER["threshold"])
+    ranked = sort_index.ordered(rows, "Overall_KPI", ascending=False)
+    projects = proj_filtered.sort_values("Avg_KPI", ascending=False)
+
+    path = os.path.join(out_dir, kind, slug(name))
+    os.makedirs(path, exist_ok=True)
+    if "csv" in formats:
+        _cards(summary).to_csv(os.path.join(path, "summary.csv"), index=False)
+        projects.to_csv(os.path.join(path, "projects.csv"), index=False)
+        with open(os.path.join(path, "employees.csv"), "wb") as f:
+            write_export(df.iloc[ranked][SHOW_COLS], "csv", f)
+    if "png" in formats:
+        os.makedirs(os.path.join(path, "charts"), exist_ok=True)
+        for chart_id, fig in figures.items():
+            fig.write_image(os.path.join(path, "charts", f"{chart_id}.png"), width=900, height=450)
+    if "html" in formats:
+        employees = df.iloc[ranked[:table_rows]][SHOW_COLS]
+        with open(os.path.join(path, "report.html"), "w", encoding="utf-8") as f:
+            f.write(_report_html(kind, name, summary, figures, employees, projects, len(df), plotlyjs))
+    result["path"] = os.path.relpath(path, out_dir)
+    return result
+
+
+def _write_index(out_dir, results, plotlyjs):
+    index = pd.DataFrame(results)
+    index.to_csv(os.path.join(out_dir, "index.csv"), index=False)
+    if plotlyjs == "directory":
+        with open(os.path.join(out_dir, "plotly.min.js"), "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+    links = "".join(
+        f"<tr><td>{html.escape(r['kind'])}</td>"
+        + (f'<td><a href="{r["path"]}/report.html">{html.escape(str(r["name"]))}</a></td>' if r["path"]
+           else f"<td>{html.escape(str(r['name']))}</td>")
+        + f"<td>{r['employees']:,}</td><td>{r['avg_kpi']}</td></tr>"
+        for r in results)
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(f"""<!DOCTYPE html><html><head><meta charset="utf-8"><title>KPI reports</title>
+<style>{STYLE}</style></head><body><h1>📊 KPI <span>Reports</span></h1>
+<div class="sub">{len(results)} reports · generated {time.strftime('%Y-%m-%d %H:%M')}</div>
+<table><tr><th>Kind</th><th>Report</th><th>Employees</th><th>Avg KPI</th></tr>{links}</table>
+</body></html>
+""")
+
+
+# ─────────────────────────────────────────────
+#  DRIVER
+# ─────────────────────────────────────────────
+def generate_reports(source, out_dir, compact=False, store=None, workers=None, formats=("html", "csv"),
+                     only=None, threshold=charts.POINT_THRESHOLD, table_rows=TABLE_ROWS, plotlyjs="directory"):
+    """Write a pack per department and project of `source` under `out_dir`; one result dict per pack."""
+    unknown = set(formats) - set(REPORT_FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown report formats: {', '.join(sorted(unknown))}")
+    if "png" in formats:
+        _kaleido()
+    os.makedirs(out_dir, exist_ok=True)
+
+    # Without a store directory the shared copy lives in a scratch store for this run
+    scratch = None
+    if store is None:
+        scratch = tempfile.mkdtemp(prefix="kpi-reports-")
+        store = DatasetStore(scratch)
+    try:
+        fingerprint = source.fingerprint()
+        df = load_source(source, compact, store, fingerprint)[0]
+        # The key load_source() wrote the tables under
+        digest = store_digest(fingerprint, compact)
+        jobs = [(kind, name, filters, out_dir, tuple(formats), table_rows, plotlyjs)
+                for kind, name, filters in report_slices(df, only)]
+
+        workers = min(workers or os.cpu_count() or 1, len(jobs))
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(store.root, digest, threshold)) as pool:
+                results = list(pool.map(_build_report, *zip(*jobs)))
+        else:
+            _init_worker(store.root, digest, threshold)
+            results = [_build_report(*job) for job in jobs]
+    finally:
+        _WORKER.clear()
+        if scratch is not None:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    _write_index(out_dir, results, plotlyjs)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("out_dir")
+    parser.add_argument("--source", help="synthetic://<n>, an employee export or an export directory "
+                                         "(default: KPI_SOURCE / KPI_EMPLOYEES, as for the dashboard)")
+    parser.add_argument("--compact", action="store_true", help="use the compact categorical schema")
+    parser.add_argument("--store", help="DatasetStore directory to share the loaded dataset through "
+                                        "(default: a scratch directory; KPI_STORE_DIR also works)")
+    parser.add_argument("--workers", type=int, help="report processes (default: one per core)")
+    parser.add_argument("--formats", nargs="+", choices=REPORT_FORMATS, default=["html", "csv"])
+    parser.add_argument("--only", choices=["department", "project"])
+    parser.add_argument("--table-rows", type=int, default=TABLE_ROWS,
+                        help="employee rows in report.html; the CSV always has the full slice")
+    parser.add_argument("--plotlyjs", choices=["directory", "cdn"], default="directory",
+                        help="one shared plotly.min.js next to the reports, or load it from the CDN")
+    parser.add_argument("--history", help="kpi.history directory for the monthly trend (or KPI_HISTORY_DIR)")
+    args = parser.parse_args(argv)
+
+    uri, compact, kwargs = source_from_env()
+    if args.source:
+        uri, kwargs = args.source, {}
+    source = open_source(uri, **kwargs)
+    history = HistoryStore(args.history) if args.history else history_from_env()
+    if history is not None:
+        source = HistorySource(source, history)
+    store_dir = args.store or os.environ.get("KPI_STORE_DIR")
+
+    t0 = time.perf_counter()
+    results = generate_reports(source, args.out_dir, compact=compact or args.compact,
+                               store=DatasetStore(store_dir) if store_dir else None,
+                               workers=args.workers, formats=args.formats, only=args.only,
+                               table_rows=args.table_rows, plotlyjs=args.plotlyjs)
+    written = sum(r["path"] is not None for r in results)
+    print(f"{written} of {len(results)} reports written to {args.out_dir} "
+          f"in {time.perf_counter() - t0:.1f}s — open {os.path.join(args.out_dir, 'index.html')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
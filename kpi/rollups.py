@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from kpi.metrics import NO_PROJECT
+
+
+# ─────────────────────────────────────────────
+#  ROLLUPS — additive sums per key
+# ─────────────────────────────────────────────
+# Share of an employee credited to their secondary project (primary is 1.0)
+SECONDARY_WEIGHT = 0.5
+
+SUMMED = {
+    "KPI":        "Overall_KPI",
+    "Completion": "Completion_Rate",
+    "Quality":    "Quality_Score",
+    "Assigned":   "Tasks_Assigned",
+    "Completed":  "Tasks_Completed",
+    "Overdue":    "Tasks_Overdue",
+}
+
+
+class _Rollup:
+    key = None
+
+    def __init__(self, df):
+        self.sums = self._sums(df)
+        self._summary = self._finish(self.sums)
+
+    def _credits(self, records):
+        # (keys, weights, row positions) — one entry per credited assignment
+        raise NotImplementedError
+
+    def _sums(self, records):
+        keys, weights, pos = self._credits(records)
+        credited = pd.DataFrame({"key": keys, "Heads": 1, "Weight": weights})
+        for name, col in SUMMED.items():
+            credited[name] = np.asarray(records[col], dtype=np.float64)[pos] * weights
+        return credited.groupby("key", sort=False).sum()
+
+    @classmethod
+    def _finish(cls, sums):
+        raise NotImplementedError
+
+    def summary(self):
+        return self._summary.reset_index()
+
+    @classmethod
+    def merge_summary(cls, partial_sums):
+        """Summary from the `sums` of rollups over disjoint sets of employees."""
+        # Sums over disjoint row sets add up to the sums over their union
+        sums = pd.concat(partial_sums).groupby(level=0, sort=False).sum()
+        return cls._finish(sums).reset_index()
+
+
+class ProjectRollup(_Rollup):
+    """Project_Summary rows crediting primary assignments in full and secondary ones by weight."""
+
+    key = "Project"
+
+    def __init__(self, df, secondary_weight=SECONDARY_WEIGHT):
+        self.secondary_weight = secondary_weight
+        super().__init__(df)
+
+    def _credits(self, records):
+        primary = np.asarray(records["Primary_Project"], dtype=object)
+        secondary = np.asarray(records["Secondary_Project"], dtype=object)
+        n = len(primary)
+        # Blank cells are <NA>, which cannot be compared; test them first
+        has_sec = pd.notna(secondary)
+        has_sec[has_sec] = secondary[has_sec] != NO_PROJECT
+        if self.secondary_weight <= 0:
+            has_sec[:] = False
+        sec_pos = np.flatnonzero(has_sec)
+        keys = np.concatenate([primary, secondary[sec_pos]])
+        weights = np.concatenate([np.ones(n), np.full(len(sec_pos), float(self.secondary_weight))])
+        return keys, weights, np.concatenate([np.arange(n), sec_pos])
+
+    @classmethod
+    def _finish(cls, sums):
+        w = sums["Weight"]
+        out = pd.DataFrame({
+            "Team_Size":       sums["Heads"].round().astype(np.int64),
+            "Avg_KPI":         (sums["KPI"] / w).round(1),
+            "Avg_Completion":  (sums["Completion"] / w).round(1),
+            "Avg_Quality":     (sums["Quality"] / w).round(1),
+            "Total_Tasks":     sums["Assigned"].round().astype(np.int64),
+            "Completed_Tasks": sums["Completed"].round().astype(np.int64),
+            "Overdue_Tasks":   sums["Overdue"].round().astype(np.int64),
+        })
+        return out.rename_axis(cls.key)
+
+
+class _GroupRollup(_Rollup):
+    # One full credit per employee to the value of their `key` column
+
+    def _credits(self, records):
+        keys = np.asarray(records[self.key], dtype=object)
+        return keys, np.ones(len(keys)), np.arange(len(keys))
+
+    @classmethod
+    def _finish(cls, sums):
+        out = pd.DataFrame({
+            "Team_Size":     sums["Heads"].round().astype(np.int64),
+            "Avg_KPI":       (sums["KPI"] / sums["Weight"]).round(1),
+            "Total_Tasks":   sums["Assigned"].round().astype(np.int64),
+            "Overdue_Tasks": sums["Overdue"].round().astype(np.int64),
+        })
+        return out.rename_axis(cls.key)
+
+
+class DepartmentRollup(_GroupRollup):
+    """Per-department KPI and task totals."""
+
+    key = "Department"
+
+
+class RoleRollup(_GroupRollup):
+    """Per-role KPI and task totals."""
+
+    key = "Role"
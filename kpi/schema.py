@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from kpi.metrics import PERF_LEVELS, level_codes
+
+
+# ─────────────────────────────────────────────
+#  COMPACT LAYOUT
+# ─────────────────────────────────────────────
+DIMENSIONS = ["Department", "Role", "Primary_Project", "Secondary_Project"]
+
+COMPACT_NUMERIC = {
+    "Tasks_Assigned":  np.int16,
+    "Tasks_Completed": np.int16,
+    "Tasks_Overdue":   np.int16,
+    "Quality_Score":   np.float32,
+    "On_Time_Rate":    np.float32,
+    "Collaboration":   np.float32,
+    "Initiative":      np.float32,
+    "Productivity":    np.float32,
+    "Completion_Rate": np.float32,
+    "Overall_KPI":     np.float32,
+}
+
+PERF_LEVEL_DTYPE = pd.CategoricalDtype(PERF_LEVELS, ordered=True)
+
+
+def performance_levels(kpi):
+    return pd.Categorical.from_codes(level_codes(kpi), dtype=PERF_LEVEL_DTYPE)
+
+
+def _fitting_int(values, preferred=np.int16):
+    # The narrowest of preferred/int32/int64 that holds every value, so a
+    # large task count widens the column instead of wrapping around
+    values = np.asarray(values)
+    if values.size == 0:
+        return preferred
+    lo, hi = values.min(), values.max()
+    for dtype in (preferred, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return np.int64
+
+
+def to_compact(df):
+    # Levels are re-derived from the float64 KPI before it is narrowed
+    levels = performance_levels(df["Overall_KPI"].to_numpy())
+    dtypes = {c: t for c, t in COMPACT_NUMERIC.items() if c in df.columns}
+    for col, dtype in dtypes.items():
+        if np.issubdtype(dtype, np.integer):
+            dtypes[col] = _fitting_int(df[col].to_numpy(), dtype)
+    out = df.astype(dtypes)
+    for col in DIMENSIONS:
+        if col in out.columns:
+            out[col] = out[col].astype("category")
+    out["Performance_Level"] = levels
+    return out
+
+
+def _same_category_dtype(columns):
+    # An Arrow round trip (e.g. a DatasetStore copy) can turn "string"
+    # categories into "str"; union_categoricals needs them identical
+    dtype = columns[0].cat.categories.dtype
+    return [col if col.cat.categories.dtype == dtype
+            else col.cat.set_categories(pd.Index(col.cat.categories, dtype=dtype))
+            for col in columns]
+
+
+def concat_compact(chunks):
+    # pd.concat falls back to object when chunk categories differ; union them instead
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+    cat_cols = [c for c in chunks[0].columns if c in DIMENSIONS]
+    merged = {c: union_categoricals(_same_category_dtype([ch[c] for ch in chunks]), sort_categories=True)
+              for c in cat_cols}
+    out = pd.concat([ch.drop(columns=cat_cols) for ch in chunks], ignore_index=True)
+    for col in cat_cols:
+        out[col] = merged[col]
+    return out[list(chunks[0].columns)]
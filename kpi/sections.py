@@ -0,0 +1,38 @@
+"""Which inputs each dashboard section reads, so its output can be reused until one of them changes."""
+
+
+FILTER_INPUTS = ("project", "department", "role", "level", "kpi_range")
+
+# Section-local widget values before the user touches them
+DEFAULT_INPUTS = {"drill_metric": "Overall_KPI", "top_n": 10, "per_department": False, "pq_mode": "sample"}
+
+# Sections built from the filtered rows depend on every filter; the project views
+# only on the project selection, the monthly trend only on departments
+DEPENDS_ON = {
+    "kpi_histogram":        FILTER_INPUTS,
+    "performance_pie":      FILTER_INPUTS,
+    "department_kpi":       FILTER_INPUTS,
+    "project_kpi":          ("project",),
+    "project_bubble":       ("project",),
+    "task_status":          FILTER_INPUTS,
+    "department_trend":     ("department",),
+    "top_employees":        FILTER_INPUTS + ("drill_metric", "top_n", "per_department"),
+    "radar":                FILTER_INPUTS,
+    "productivity_quality": FILTER_INPUTS + ("pq_mode",),
+    "whatif_levels":        FILTER_INPUTS + ("weights",),
+    "whatif_top":           FILTER_INPUTS + ("weights",),
+    "whatif_projects":      FILTER_INPUTS + ("weights",),
+}
+
+
+def filter_inputs(filter_key):
+    # FilterIndex.normalize() keys are ordered like FILTER_INPUTS
+    return dict(zip(FILTER_INPUTS, filter_key))
+
+
+def section_key(section, inputs):
+    try:
+        deps = DEPENDS_ON[section]
+    except KeyError:
+        raise KeyError(f"No dependencies declared for section {section!r}") from None
+    return (section,) + tuple(inputs[name] for name in deps)
@@ -0,0 +1,364 @@
+import hashlib
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from kpi.data import generate_data, project_summary
+from kpi.metrics import add_derived_columns
+from kpi.rollups import ProjectRollup, SECONDARY_WEIGHT
+from kpi.schema import DIMENSIONS, concat_compact, to_compact
+
+
+# ─────────────────────────────────────────────
+#  COLUMNS READ FROM EXPORTS
+# ─────────────────────────────────────────────
+# Only these are read; anything else in the export is skipped at parse time.
+SOURCE_DTYPES = {
+    "ID":                "string",
+    "Name":              "string",
+    "Department":        "string",
+    "Role":              "string",
+    "Primary_Project":   "string",
+    "Secondary_Project": "string",
+    "Tasks_Assigned":    "int64",
+    "Tasks_Completed":   "int64",
+    "Tasks_Overdue":     "int64",
+    "Quality_Score":     "float64",
+    "On_Time_Rate":      "float64",
+    "Collaboration":     "float64",
+    "Initiative":        "float64",
+    "Productivity":      "float64",
+}
+
+# Columns an export may leave out, and what to fill them with
+OPTIONAL_DEFAULTS = {
+    "Secondary_Project": "—",
+    "Initiative":        float("nan"),
+}
+
+TREND_DTYPES = {"Month": "string", "Department": "string", "KPI_Score": "float64"}
+
+DEFAULT_CHUNKSIZE = 250_000
+
+EXPORT_SUFFIXES = (".csv", ".csv.gz", ".csv.zip", ".csv.bz2", ".parquet", ".pq")
+MONTH_PATTERN = re.compile(r"(\d{4})-(\d{2})")
+
+
+def _file_stamp(path):
+    if path is None:
+        return None
+    st = os.stat(path)
+    return (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+
+
+def file_digest(path, blocksize=1 << 20):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(blocksize), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _empty_trend():
+    return pd.DataFrame({c: pd.Series(dtype=t) for c, t in TREND_DTYPES.items()})
+
+
+def read_trend(path):
+    if path is None:
+        return _empty_trend()
+    if path.lower().endswith((".parquet", ".pq")):
+        return pd.read_parquet(path, columns=list(TREND_DTYPES)).astype(TREND_DTYPES)
+    return pd.read_csv(path, usecols=list(TREND_DTYPES), dtype=TREND_DTYPES)
+
+
+def prepare_chunk(chunk, compact=False):
+    missing = [c for c in SOURCE_DTYPES if c not in chunk.columns and c not in OPTIONAL_DEFAULTS]
+    if missing:
+        raise ValueError(f"Employee export is missing required columns: {', '.join(missing)}")
+    for col, fill in OPTIONAL_DEFAULTS.items():
+        # Missing entirely or left blank in some rows
+        chunk[col] = chunk[col].fillna(fill) if col in chunk.columns else fill
+    chunk = add_derived_columns(chunk[list(SOURCE_DTYPES)].astype(SOURCE_DTYPES))
+    return to_compact(chunk) if compact else chunk
+
+
+# ─────────────────────────────────────────────
+#  SOURCES
+# ─────────────────────────────────────────────
+class DataSource:
+    """Produces the (df, trend_df, proj_df) triple the dashboard renders."""
+
+    def iter_chunks(self, compact=False):
+        raise NotImplementedError
+
+    def load_trend(self):
+        return _empty_trend()
+
+    def fingerprint(self):
+        # Identifies the source's current content for the dataset store
+        raise NotImplementedError
+
+    def attach(self, tables):
+        # Called with the tables actually served, e.g. the memory-mapped copy
+        # from a DatasetStore; sources that reuse rows between loads keep these
+        pass
+
+    def load_rows(self, compact=False):
+        # Each chunk moves into Arrow as it is read; concat_tables only links the
+        # buffers, and self_destruct frees each column once it has been converted,
+        # so the rows are never held twice
+        tables = [pa.Table.from_pandas(chunk, preserve_index=False) for chunk in self.iter_chunks(compact)]
+        if not tables:
+            empty = pd.DataFrame({c: pd.Series(dtype=t) for c, t in SOURCE_DTYPES.items()})
+            return prepare_chunk(empty, compact)
+        table = pa.concat_tables(tables, promote_options="permissive")
+        del tables
+        df = table.to_pandas(self_destruct=True, split_blocks=True)
+        if compact:
+            # Same categories, in the same order, as concat_compact
+            for col in DIMENSIONS:
+                categories = pd.Index(sorted(df[col].cat.categories), dtype=SOURCE_DTYPES[col])
+                df[col] = df[col].cat.set_categories(categories)
+        return df
+
+    def load(self, compact=False):
+        df = self.load_rows(compact)
+        return df, self.load_trend(), project_summary(df)
+
+
+class SyntheticSource(DataSource):
+    def __init__(self, n_employees=100, seed=99):
+        self.n_employees = n_employees
+        self.seed = seed
+
+    def load(self, compact=False):
+        df, trend_df, proj_df = generate_data(self.n_employees, seed=self.seed)
+        return (to_compact(df) if compact else df), trend_df, proj_df
+
+    def iter_chunks(self, compact=False):
+        yield self.load(compact)[0]
+
+    def fingerprint(self):
+        return ("synthetic", self.n_employees, self.seed)
+
+
+class CsvSource(DataSource):
+    def __init__(self, path, chunksize=DEFAULT_CHUNKSIZE, trend_path=None):
+        self.path = path
+        self.chunksize = chunksize
+        self.trend_path = trend_path
+
+    def fingerprint(self):
+        return (type(self).__name__, _file_stamp(self.path), _file_stamp(self.trend_path))
+
+    def iter_chunks(self, compact=False):
+        with pd.read_csv(self.path, usecols=lambda c: c in SOURCE_DTYPES, dtype=SOURCE_DTYPES,
+                         chunksize=self.chunksize) as reader:
+            for chunk in reader:
+                yield prepare_chunk(chunk, compact)
+
+    def load_trend(self):
+        return read_trend(self.trend_path)
+
+
+class ParquetSource(DataSource):
+    def __init__(self, path, chunksize=DEFAULT_CHUNKSIZE, trend_path=None):
+        self.path = path
+        self.chunksize = chunksize
+        self.trend_path = trend_path
+
+    def fingerprint(self):
+        return (type(self).__name__, _file_stamp(self.path), _file_stamp(self.trend_path))
+
+    def iter_chunks(self, compact=False):
+        pf = pq.ParquetFile(self.path)
+        columns = [c for c in SOURCE_DTYPES if c in pf.schema_arrow.names]
+        for batch in pf.iter_batches(batch_size=self.chunksize, columns=columns):
+            yield prepare_chunk(batch.to_pandas(), compact)
+
+    def load_trend(self):
+        return read_trend(self.trend_path)
+
+
+# ─────────────────────────────────────────────
+#  DIRECTORY OF MONTHLY EXPORTS — parsed in parallel, merged map-reduce style
+# ─────────────────────────────────────────────
+def find_exports(root):
+    """(path, month, group) per export under `root`, e.g. Sales_2024-03.csv or 2024-03/Sales.parquet.
+
+    `month` is the YYYY-MM in the path; `group` is what remains of the name
+    (usually the department), and the latest month of each group is the
+    current snapshot.
+    """
+    found = []
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if name.startswith(".") or not name.lower().endswith(EXPORT_SUFFIXES):
+                continue
+            path = os.path.join(dirpath, name)
+            suffix = next(s for s in EXPORT_SUFFIXES if name.lower().endswith(s))
+            rel = os.path.relpath(path, root)[:-len(suffix)].replace(os.sep, "/")
+            match = MONTH_PATTERN.search(rel)
+            if match is None:
+                raise ValueError(f"No YYYY-MM month in export path: {rel + suffix!r}")
+            rest = (rel[:match.start()] + "/" + rel[match.end():]).split("/")
+            group = "/".join(p.strip("_-. ") for p in rest if p.strip("_-. "))
+            found.append((path, match.group(0), group))
+    return sorted(found, key=lambda f: (f[2], f[1], f[0]))
+
+
+def _worker_context():
+    # forkserver where the platform has it (not on Windows); spawn otherwise.
+    # Neither forks the threaded server with other threads' locks held.
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+
+def _ingest_export(path, month, current, compact, secondary_weight):
+    # Map step, run in a worker: parse and derive one export, then reduce it to
+    # partials the parent can merge. Only current exports ship their rows back.
+    df = open_source(path).load_rows(compact)
+    kpi = df.groupby(df["Department"].astype(str), sort=False)["Overall_KPI"].agg(["sum", "count"])
+    trend = kpi.rename_axis("Department").reset_index().assign(Month=month)
+    if not current:
+        return None, trend, None
+    return df, trend, ProjectRollup(df, secondary_weight).sums
+
+
+class DirectorySource(DataSource):
+    """A directory with one employee export per department per month.
+
+    Per-file partials (monthly KPI and project sums) are kept between loads,
+    keyed by content hash, so a reload re-parses only the exports that were
+    added or changed. Rows are not cached per file: an unchanged current
+    export is sliced back out of the frame the last load served.
+    """
+
+    def __init__(self, path, workers=None, trend_path=None, secondary_weight=SECONDARY_WEIGHT):
+        self.path = path
+        self.workers = workers
+        self.trend_path = trend_path
+        self.secondary_weight = secondary_weight
+        self.reparsed = 0
+        self._digests = {}
+        self._partials = {}
+        # The last served frame and each current export's (start, stop) in it
+        self._rows = None
+        self._spans = {}
+
+    def _content_key(self, path, month, compact):
+        # Only files whose size/mtime moved are hashed again. The month is part
+        # of the key: identical files for two months give different trend rows.
+        stamp = _file_stamp(path)
+        if stamp not in self._digests:
+            self._digests[stamp] = file_digest(path)
+        return self._digests[stamp], month, compact, self.secondary_weight
+
+    def fingerprint(self):
+        exports = find_exports(self.path)
+        return (type(self).__name__, tuple(_file_stamp(p) for p, _, _ in exports),
+                _file_stamp(self.trend_path), self.secondary_weight)
+
+    def _tasks(self, compact):
+        exports = find_exports(self.path)
+        if not exports:
+            raise ValueError(f"No employee exports found under {self.path!r}")
+        latest = {}
+        for _, month, group in exports:
+            latest[group] = max(month, latest.get(group, month))
+        return [(p, month, month == latest[group], compact, self.secondary_weight)
+                for p, month, group in exports]
+
+    def iter_chunks(self, compact=False):
+        for path, _, current, _, _ in self._tasks(compact):
+            if current:
+                yield open_source(path).load_rows(compact)
+
+    def attach(self, tables):
+        # Keep the served copy rather than our own, so the rows exist once
+        if self._rows is not None and len(tables[0]) == len(self._rows):
+            self._rows = tables[0]
+
+    def load(self, compact=False):
+        tasks = self._tasks(compact)
+        keys = [self._content_key(task[0], task[1], compact) for task in tasks]
+        partials = [self._partials.get(key) for key in keys]
+        # A current export needs its project sums and a span of the last frame
+        todo = [i for i, (task, key, p) in enumerate(zip(tasks, keys, partials))
+                if p is None or (task[2] and (p[1] is None or key not in self._spans))]
+
+        workers = min(self.workers or os.cpu_count() or 1, len(todo))
+        if workers > 1:
+            # Loads run on the refresher thread inside a threaded server, and a
+            # forked child can inherit locks held by other threads
+            with ProcessPoolExecutor(max_workers=workers, mp_context=_worker_context()) as pool:
+                done = list(pool.map(_ingest_export, *zip(*[tasks[i] for i in todo])))
+        else:
+            done = [_ingest_export(*tasks[i]) for i in todo]
+        parsed = {}
+        for i, (rows, trend, sums) in zip(todo, done):
+            partials[i] = (trend, sums)
+            if rows is not None:
+                parsed[i] = rows
+        self.reparsed = len(todo)
+
+        # Reduce: current rows concatenated, per-month KPI and per-project sums added up
+        parts, spans, start = [], {}, 0
+        for i, (task, key) in enumerate(zip(tasks, keys)):
+            if not task[2]:
+                continue
+            if i in parsed:
+                part = parsed.pop(i)
+            else:
+                lo, hi = self._spans[key]
+                part = self._rows.iloc[lo:hi]
+            parts.append(part)
+            spans[key] = (start, start + len(part))
+            start += len(part)
+        df = concat_compact(parts) if compact else pd.concat(parts, ignore_index=True)
+        del parts
+
+        self._partials = dict(zip(keys, partials))
+        self._rows, self._spans = df, spans
+        self._digests = {k: v for k, v in self._digests.items() if v in {key[0] for key in keys}}
+
+        if self.trend_path is None:
+            kpi = pd.concat([t for t, _ in partials]).groupby(["Month", "Department"], sort=True).sum()
+            trend_df = (kpi["sum"] / kpi["count"]).round(1).rename("KPI_Score").reset_index()
+            trend_df = trend_df.astype(TREND_DTYPES)
+        else:
+            trend_df = read_trend(self.trend_path)
+
+        proj_df = ProjectRollup.merge_summary([sums for task, (_, sums) in zip(tasks, partials) if task[2]])
+        return df, trend_df, proj_df
+
+
+def open_source(uri, **kwargs):
+    """`synthetic://<n>`, a path to a .csv[.gz] / .parquet employee export, or a directory of monthly exports."""
+    if uri.startswith("synthetic://"):
+        n = uri[len("synthetic://"):]
+        return SyntheticSource(int(n) if n else 100, **kwargs)
+    if os.path.isdir(uri):
+        return DirectorySource(uri, **kwargs)
+    lower = uri.lower()
+    if lower.endswith((".parquet", ".pq")):
+        return ParquetSource(uri, **kwargs)
+    if lower.endswith((".csv", ".csv.gz", ".csv.zip", ".csv.bz2")):
+        return CsvSource(uri, **kwargs)
+    raise ValueError(f"Unsupported data source: {uri!r}")
+
+
+def source_from_env():
+    uri = os.environ.get("KPI_SOURCE") or f"synthetic://{os.environ.get('KPI_EMPLOYEES', 100)}"
+    compact = os.environ.get("KPI_COMPACT", "0").lower() in ("1", "true", "yes")
+    kwargs = {}
+    if os.environ.get("KPI_TREND_SOURCE") and not uri.startswith("synthetic://"):
+        kwargs["trend_path"] = os.environ["KPI_TREND_SOURCE"]
+    if os.environ.get("KPI_INGEST_WORKERS") and os.path.isdir(uri):
+        kwargs["workers"] = int(os.environ["KPI_INGEST_WORKERS"])
+    return uri, compact, kwargs
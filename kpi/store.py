@@ -0,0 +1,100 @@
+"""Prepared (df, trend_df, proj_df) triples kept on disk as uncompressed Arrow IPC files.
+
+Reads memory-map the files read-only, so every session and every process on a
+host shares the same page-cache copy, and a new process starts without
+regenerating or re-parsing the source.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import pyarrow as pa
+import pyarrow.ipc  # noqa: F401
+
+
+TABLES = ("employees", "trend", "projects")
+STORE_FORMAT = 1
+
+
+def dataset_digest(*parts):
+    # Stable across processes, unlike hash()
+    return hashlib.sha256(repr((STORE_FORMAT,) + parts).encode("utf-8")).hexdigest()[:20]
+
+
+# ─────────────────────────────────────────────
+#  STORE
+# ─────────────────────────────────────────────
+class DatasetStore:
+    """A directory of immutable datasets, one sub-directory per digest."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, digest):
+        return os.path.join(self.root, digest)
+
+    def has(self, digest):
+        return os.path.exists(os.path.join(self.path(digest), "manifest.json"))
+
+    def save(self, digest, tables, meta=None):
+        """Write the triple under `digest`; the directory appears atomically, first writer wins."""
+        os.makedirs(self.root, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=f".{digest}-", dir=self.root)
+        try:
+            rows = {}
+            for name, frame in zip(TABLES, tables):
+                table = pa.Table.from_pandas(frame, preserve_index=None)
+                # Uncompressed, so readers can map the buffers instead of decoding them
+                with pa.OSFile(os.path.join(tmp, f"{name}.arrow"), "wb") as sink, \
+                        pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+                rows[name] = table.num_rows
+            with open(os.path.join(tmp, "manifest.json"), "w", encoding="utf-8") as f:
+                json.dump({"format": STORE_FORMAT, "rows": rows, "meta": meta or {}}, f, indent=2)
+            try:
+                os.rename(tmp, self.path(digest))
+            except OSError:
+                # Another process stored the same digest first
+                if not self.has(digest):
+                    raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def remove(self, digest):
+        """Delete a stored dataset; processes that still map its files keep their pages."""
+        if not self.has(digest):
+            return
+        # Renamed first, so the digest disappears in one step
+        doomed = tempfile.mkdtemp(prefix=f".{digest}-old-", dir=self.root)
+        try:
+            os.rename(self.path(digest), os.path.join(doomed, digest))
+        except OSError:
+            pass
+        shutil.rmtree(doomed, ignore_errors=True)
+
+    def open(self, digest):
+        """The stored triple, backed by read-only memory maps where the dtypes allow."""
+        out = []
+        for name in TABLES:
+            source = pa.memory_map(os.path.join(self.path(digest), f"{name}.arrow"), "r")
+            table = pa.ipc.open_file(source).read_all()
+            # split_blocks keeps one array per column, so numeric columns stay views of the map
+            out.append(table.to_pandas(split_blocks=True))
+        return tuple(out)
+
+    def load_or_build(self, digest, build, meta=None):
+        if not self.has(digest):
+            self.save(digest, build(), meta)
+        # Reopened even after a build, so this process shares the mapped copy too
+        return self.open(digest)
+
+    def manifest(self, digest):
+        with open(os.path.join(self.path(digest), "manifest.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+
+def store_from_env():
+    root = os.environ.get("KPI_STORE_DIR")
+    return DatasetStore(root) if root else None
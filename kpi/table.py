@@ -0,0 +1,28 @@
+import math
+
+
+# ─────────────────────────────────────────────
+#  PAGINATED EMPLOYEE TABLE
+# ─────────────────────────────────────────────
+SHOW_COLS = ["ID","Name","Department","Role","Primary_Project",
+             "Tasks_Assigned","Tasks_Completed","Tasks_Overdue",
+             "Completion_Rate","On_Time_Rate","Quality_Score",
+             "Productivity","Overall_KPI","Performance_Level"]
+
+PAGE_SIZES = [25, 50, 100, 250, 500]
+
+
+def page_count(n_rows, page_size):
+    return max(1, math.ceil(n_rows / page_size))
+
+
+def table_page(df, sort_index, rows, sort_col="Overall_KPI", ascending=False,
+               page=1, page_size=PAGE_SIZES[1], columns=SHOW_COLS):
+    # Only the requested page is materialized; the index is the 1-based rank
+    n_rows = len(df) if rows is None else len(rows)
+    page = min(max(1, page), page_count(n_rows, page_size))
+    offset = (page - 1) * page_size
+    positions = sort_index.ordered(rows, sort_col, ascending, stop=offset + page_size)[offset:]
+    out = df.iloc[positions][columns]
+    out.index = range(offset + 1, offset + 1 + len(out))
+    return out, offset
@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+
+from kpi.cache import LRUCache
+from kpi.filters import value_bins
+from kpi.metrics import KPI_WEIGHTS, NO_PROJECT, PERF_LEVELS, level_codes
+from kpi.rollups import SECONDARY_WEIGHT
+
+
+# ─────────────────────────────────────────────
+#  WHAT-IF WEIGHTING — Overall_KPI under any weights, one mat-vec per change
+# ─────────────────────────────────────────────
+SCORE_COLUMNS = [
+    "Productivity", "Completion_Rate", "On_Time_Rate",
+    "Quality_Score", "Collaboration", "Initiative",
+]
+
+# The live formula; Initiative is collected but not part of it
+DEFAULT_WEIGHTS = {c: KPI_WEIGHTS.get(c, 0.0) for c in SCORE_COLUMNS}
+
+TOP_COLUMNS = ["Name", "Department", "Primary_Project", "Overall_KPI"]
+
+
+def weight_vector(weights):
+    """float32 weights in SCORE_COLUMNS order, scaled to sum to 1 so scores stay on 0–100."""
+    unknown = set(weights) - set(SCORE_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown KPI weight columns: {', '.join(sorted(unknown))}")
+    w = np.array([weights.get(c, 0.0) for c in SCORE_COLUMNS], dtype=np.float64)
+    if (w < 0).any() or not w.sum() > 0:
+        raise ValueError("KPI weights must be non-negative with at least one above zero")
+    return (w / w.sum()).astype(np.float32)
+
+
+def weight_key(weights):
+    # Hashable and equal for proportional weightings, e.g. for cache keys
+    return tuple(round(float(x), 6) for x in weight_vector(weights))
+
+
+def _project_codes(codes, uniques, projects):
+    # Codes into `projects`; no project maps to the extra bin len(projects)
+    lookup = np.append(projects.get_indexer(pd.Index(list(uniques), dtype=object)), -1)
+    lookup[lookup < 0] = len(projects)
+    return lookup[codes].astype(np.int32)
+
+
+class WeightEngine:
+    """Levels, rankings, project averages and a Top-N for a what-if KPI weighting.
+
+    The score columns are copied once into a C-contiguous float32 (n, k)
+    matrix, so a new weighting is one matrix-vector product over the selected
+    rows and the DataFrame is never touched.
+    """
+
+    def __init__(self, df, secondary_weight=SECONDARY_WEIGHT, maxsize=64):
+        self.df = df
+        self.n = len(df)
+        scores = np.empty((self.n, len(SCORE_COLUMNS)), dtype=np.float32)
+        for j, col in enumerate(SCORE_COLUMNS):
+            scores[:, j] = df[col].to_numpy(dtype=np.float32, na_value=np.nan)
+        missing = np.isnan(scores)
+        # A missing score (e.g. an export without Initiative) is left out of
+        # that row's KPI and its other weights rescaled
+        self.present = (~missing).astype(np.float32) if missing.any() else None
+        scores[missing] = 0.0
+        self.scores = scores
+
+        self.current = df["Overall_KPI"].to_numpy(dtype=np.float32)
+        self.current_levels = level_codes(self.current)
+        self.current_sorted = np.sort(self.current)
+        self.default_vector = weight_vector(DEFAULT_WEIGHTS)
+
+        self.dept_codes, self.departments = value_bins(df["Department"])
+        primary = pd.factorize(df["Primary_Project"])
+        secondary = pd.factorize(df["Secondary_Project"])
+        self.projects = pd.Index(sorted((set(primary[1]) | set(secondary[1])) - {NO_PROJECT}), dtype=object)
+        self.primary = _project_codes(*primary, self.projects)
+        # Secondary credit is dropped entirely when it carries no weight
+        self.secondary = _project_codes(*secondary, self.projects) if secondary_weight > 0 else None
+        self.secondary_weight = secondary_weight
+
+        self.cache = LRUCache(maxsize)
+
+    def score(self, weights, rows=None):
+        """What-if Overall_KPI of the selected rows, rounded like the stored column."""
+        w = weight_vector(weights)
+        subset = rows is not None and len(rows) != self.n
+        if np.array_equal(w, self.default_vector):
+            # The live weighting: the stored column, free of float32 rounding drift
+            return self.current[rows] if subset else self.current.copy()
+        # Scoring every row and gathering after is cheaper than gathering the k score columns
+        kpi = self.scores @ w
+        if self.present is not None:
+            credited = self.present @ w
+            with np.errstate(divide="ignore", invalid="ignore"):
+                kpi = np.where(credited > 0, kpi / credited, np.float32(np.nan)).astype(np.float32)
+        if subset:
+            kpi = kpi[rows]
+        return np.round(kpi, 1, out=kpi)
+
+    def _ranked(self, frame, key):
+        frame["Rank_Current"] = frame["Current"].rank(ascending=False, method="min").astype("Int64")
+        frame["Rank_What_if"] = frame["What_if"].rank(ascending=False, method="min").astype("Int64")
+        frame["Rank_Change"] = frame["Rank_Current"] - frame["Rank_What_if"]
+        frame[["Current", "What_if"]] = frame[["Current", "What_if"]].round(1)
+        return frame.sort_values(["Rank_What_if", key], kind="stable").reset_index(drop=True)
+
+    def _compute(self, rows, weights, top_n):
+        subset = rows is not None and len(rows) != self.n
+        kpi = self.score(weights, rows)
+        current = self.current[rows] if subset else self.current
+        before = self.current_levels[rows] if subset else self.current_levels
+        after = level_codes(kpi)
+        # Rows with no weighted score present are left unscored
+        valid = ~np.isnan(kpi)
+        n = len(kpi)
+        shift = np.where(valid, after - before, 0)
+        promoted, demoted = int(np.count_nonzero(shift > 0)), int(np.count_nonzero(shift < 0))
+
+        levels = pd.DataFrame({
+            "Level":   PERF_LEVELS,
+            "Current": np.bincount(before, minlength=len(PERF_LEVELS)),
+            "What_if": np.bincount(after[valid], minlength=len(PERF_LEVELS)),
+        })
+
+        # As for projects, the last bin collects rows with a blank department and is dropped
+        dept = self.dept_codes[rows] if subset else self.dept_codes
+        n_dept = len(self.departments) + 1
+        heads = np.bincount(dept, minlength=n_dept)[:-1]
+        present = heads > 0
+        departments = self._ranked(pd.DataFrame({
+            "Department": np.asarray(self.departments, dtype=object)[present],
+            "Employees":  heads[present],
+            "Current":    np.bincount(dept, weights=current, minlength=n_dept)[:-1][present] / heads[present],
+            "What_if":    np.bincount(dept, weights=kpi, minlength=n_dept)[:-1][present] / heads[present],
+        }), "Department")
+
+        # Project credit as in ProjectRollup: primary in full, secondary by weight.
+        # The last bin collects rows without a (secondary) project and is dropped.
+        primary = self.primary[rows] if subset else self.primary
+        secondary = None
+        if self.secondary is not None:
+            secondary = self.secondary[rows] if subset else self.secondary
+        n_bins = len(self.projects) + 1
+
+        def credited(values=None):
+            total = np.bincount(primary, weights=values, minlength=n_bins).astype(np.float64)
+            if secondary is not None:
+                total += self.secondary_weight * np.bincount(secondary, weights=values, minlength=n_bins)
+            return total[:-1]
+
+        team = np.bincount(primary, minlength=n_bins)[:-1]
+        if secondary is not None:
+            team += np.bincount(secondary, minlength=n_bins)[:-1]
+        credit = credited()
+        staffed = credit > 0
+        projects = self._ranked(pd.DataFrame({
+            "Project":   self.projects.to_numpy()[staffed],
+            "Team_Size": team[staffed],
+            "Current":   credited(current)[staffed] / credit[staffed],
+            "What_if":   credited(kpi)[staffed] / credit[staffed],
+        }), "Project")
+
+        # Top-N by partition, so only N scores are ever sorted
+        k = min(top_n, n)
+        if k < n:
+            best = np.argpartition(-kpi, k - 1)[:k]
+        else:
+            best = np.arange(n)
+        best = best[np.lexsort((best, -kpi[best]))][:k]
+        best = best[valid[best]]
+        positions = rows[best] if subset else best
+        top = self.df.iloc[positions][TOP_COLUMNS].reset_index(drop=True)
+        top.insert(3, "What_if_KPI", kpi[best].astype(np.float64).round(1))
+        # Where each of them stood under the live weighting
+        if subset:
+            top["Rank_Current"] = (current[None, :] > current[best][:, None]).sum(axis=1) + 1
+        else:
+            top["Rank_Current"] = n - np.searchsorted(self.current_sorted, current[best], side="right") + 1
+
+        return {
+            "count":        n,
+            "weights":      dict(zip(SCORE_COLUMNS, weight_vector(weights).tolist())),
+            "kpi_mean":     float(kpi[valid].mean()) if valid.any() else float("nan"),
+            "current_mean": float(current.mean()) if n else float("nan"),
+            "moved":        promoted + demoted,
+            "promoted":     promoted,
+            "demoted":      demoted,
+            "levels":       levels,
+            "departments":  departments,
+            "projects":     projects,
+            "top":          top,
+        }
+
+    def summary(self, key, rows=None, weights=DEFAULT_WEIGHTS, top_n=10):
+        return self.cache.get_or_compute((key, weight_key(weights), top_n),
+                                         lambda: self._compute(rows, weights, top_n))
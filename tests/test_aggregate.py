@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpi.aggregate import RADAR, Aggregator
+from kpi.data import generate_data
+from kpi.schema import to_compact
+from kpi.sources import open_source
+
+
+def _expected(df):
+    pending = (df["Tasks_Assigned"] - df["Tasks_Completed"] - df["Tasks_Overdue"]).clip(lower=0)
+    dept_kpi = df.groupby("Department", observed=True)["Overall_KPI"].mean().round(1)
+    return {
+        "count":           len(df),
+        "kpi_mean":        df["Overall_KPI"].mean(),
+        "completion_mean": df["Completion_Rate"].mean(),
+        "on_time_mean":    df["On_Time_Rate"].mean(),
+        "quality_mean":    df["Quality_Score"].mean(),
+        "overdue_total":   int(df["Tasks_Overdue"].sum()),
+        "radar":           [df[c].mean() for _, c in RADAR],
+        "dept_kpi":        dict(zip(dept_kpi.index.astype(str), dept_kpi)),
+        "perf_counts":     df["Performance_Level"].value_counts().astype(int).to_dict(),
+        "pending":         int(pending.sum()),
+    }
+
+
+def _check(summary, df):
+    want = _expected(df)
+    assert summary["count"] == want["count"]
+    for key in ("kpi_mean", "completion_mean", "on_time_mean", "quality_mean"):
+        assert summary[key] == pytest.approx(want[key])
+    assert summary["overdue_total"] == want["overdue_total"]
+    assert summary["radar"][1] == pytest.approx(want["radar"])
+    dept = summary["dept_kpi"]
+    assert dict(zip(dept["Department"].astype(str), dept["Overall_KPI"])) == pytest.approx(want["dept_kpi"])
+    perf = summary["perf_counts"]
+    assert dict(zip(perf["Level"], perf["Count"])) == {k: v for k, v in want["perf_counts"].items() if v}
+    assert summary["task_status"]["Count"][1] == want["pending"]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_summary_matches_pandas(compact):
+    df = generate_data(5000)[0]
+    if compact:
+        df = to_compact(df)
+    agg = Aggregator(df)
+    rng = np.random.default_rng(5)
+    _check(agg.summary("all"), df)
+    for i in range(5):
+        rows = np.sort(rng.choice(len(df), rng.integers(1, len(df)), replace=False))
+        _check(agg.summary(i, rows), df.iloc[rows])
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_blank_department_and_initiative_cells(tmp_path, compact):
+    df = generate_data(1000)[0]
+    df.loc[[5, 9], "Department"] = None
+    df.loc[[1, 2, 3], "Initiative"] = None
+    df.to_csv(tmp_path / "employees.csv", index=False)
+    df = open_source(str(tmp_path / "employees.csv")).load_rows(compact)
+
+    summary = Aggregator(df).summary("all")
+    assert not np.isnan(summary["radar"][1]).any()
+    _check(summary, df)
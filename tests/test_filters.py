@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from kpi.data import generate_data
+from kpi.filters import FILTER_COLUMNS, FilterIndex
+from kpi.pipeline import default_filters
+from kpi.schema import to_compact
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["default", "compact"])
+def employees(request):
+    df = generate_data(20_000)[0]
+    return to_compact(df) if request.param else df
+
+
+def _isin_rows(df, project, department, role, level, kpi_range):
+    mask = (df["Primary_Project"].isin(project) & df["Department"].isin(department) &
+            df["Role"].isin(role) & df["Performance_Level"].isin(level) &
+            (df["Overall_KPI"] >= kpi_range[0]) & (df["Overall_KPI"] <= kpi_range[1]))
+    return np.flatnonzero(mask.to_numpy())
+
+
+def _random_filters(rng, defaults):
+    filters = {}
+    for key in FILTER_COLUMNS:
+        values = defaults[key]
+        # Everything, nothing, or a random subset (either side of half)
+        size = rng.choice([len(values), 0, rng.integers(1, len(values) + 1)], p=[0.2, 0.05, 0.75])
+        filters[key] = list(rng.choice(values, size, replace=False))
+    lo = float(rng.uniform(0, 100))
+    filters["kpi_range"] = (lo, float(rng.uniform(lo, 100))) if rng.random() < 0.7 else (0, 100)
+    return filters
+
+
+def test_select_matches_isin_mask(employees):
+    index = FilterIndex(employees)
+    defaults = default_filters(employees, index)
+    rng = np.random.default_rng(11)
+    np.testing.assert_array_equal(index.select(**defaults), np.arange(len(employees)))
+    for _ in range(200):
+        filters = _random_filters(rng, defaults)
+        np.testing.assert_array_equal(index.select(**filters), _isin_rows(employees, **filters))
+
+
+def test_equal_selections_share_a_key(employees):
+    index = FilterIndex(employees)
+    defaults = default_filters(employees, index)
+    reordered = {k: v[::-1] if isinstance(v, list) else v for k, v in defaults.items()}
+    assert index.normalize(**reordered) == index.normalize(**dict(defaults, kpi_range=(-5, 105)))
+
+
+def test_defaults_from_the_index_match_a_scan(employees):
+    assert default_filters(employees, FilterIndex(employees)) == default_filters(employees)
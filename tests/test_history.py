@@ -0,0 +1,43 @@
+import pytest
+
+from kpi.data import generate_data
+from kpi.history import HistorySource, HistoryStore, main
+from kpi.sources import open_source
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    df = generate_data(500)[0]
+    for month in ["2024-01", "2024-02", "2024-03"]:
+        store.append(month, df)
+    return store
+
+
+@pytest.mark.parametrize("start", ["2024-1", "2024-13", "24-01", "2024/01"])
+def test_malformed_month_bounds_are_rejected(store, start):
+    with pytest.raises(ValueError):
+        store.months(start=start)
+    with pytest.raises(ValueError):
+        store.rollup("Department", end=start)
+
+
+def test_malformed_cli_month_exits_with_usage_error(store):
+    with pytest.raises(SystemExit):
+        main(["rollup", store.root, "Department", "--start", "2024-1"])
+
+
+@pytest.mark.parametrize("by_month", [True, False])
+def test_empty_range_keeps_column_order(store, by_month):
+    full = store.rollup("Department", "2024-02", "2024-03", by_month=by_month)
+    empty = store.rollup("Department", "2025-01", "2025-06", by_month=by_month)
+    assert empty.empty
+    assert list(empty.columns) == list(full.columns)
+
+
+@pytest.mark.parametrize("months", [2, 3, 12])
+def test_history_trend_keeps_available_months(store, months):
+    source = HistorySource(open_source("synthetic://200"), store, months=months)
+    trend = source.load_trend()
+    assert trend["Month"].nunique() == min(months, 3)
+    assert trend["Month"].max() == "2024-03"
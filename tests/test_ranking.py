@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from kpi.data import generate_data
+from kpi.ranking import RANK_METRICS, SortIndex
+from kpi.schema import to_compact
+
+
+@pytest.fixture(scope="module", params=[False, True], ids=["default", "compact"])
+def ranked(request):
+    df = generate_data(20_000)[0]
+    if request.param:
+        df = to_compact(df)
+    return df.reset_index(drop=True), SortIndex(df, presort=RANK_METRICS)
+
+
+def _selections(n, seed=3):
+    rng = np.random.default_rng(seed)
+    yield None
+    yield np.arange(n)
+    yield np.empty(0, dtype=np.int64)
+    for size in (1, 50, n // 3):
+        yield np.sort(rng.choice(n, size, replace=False))
+
+
+@pytest.mark.parametrize("column", ["Quality_Score", "Overall_KPI", "Name"])
+@pytest.mark.parametrize("ascending", [True, False])
+def test_ordered_matches_sort_values(ranked, column, ascending):
+    df, index = ranked
+    for rows in _selections(len(df)):
+        frame = df if rows is None else df.iloc[rows]
+        expected = frame.sort_values(column, ascending=ascending, kind="stable").index[:25]
+        got = index.ordered(rows, column, ascending=ascending, stop=25)
+        np.testing.assert_array_equal(got, expected)
+
+
+@pytest.mark.parametrize("column", ["Quality_Score", "Productivity"])
+def test_top_by_group_matches_groupby_head(ranked, column):
+    df, index = ranked
+    for rows in _selections(len(df)):
+        frame = df if rows is None else df.iloc[rows]
+        ranked_rows = frame.sort_values(column, ascending=False, kind="stable")
+        expected = ranked_rows.groupby("Department", observed=True, sort=True).head(5)
+        got = index.top_by_group(rows, column, "Department", 5)
+        # Grouped by department in code order, each group best-first
+        assert sorted(got) == sorted(expected.index)
+        for _, group in df.loc[got].groupby("Department", observed=True, sort=False):
+            np.testing.assert_array_equal(group.index, expected.index[expected.index.isin(group.index)])
+
+
+@pytest.mark.parametrize("column", ["Quality_Score", "Overall_KPI"])
+def test_percentile_matches_brute_force(ranked, column):
+    df, index = ranked
+    values = df[column].to_numpy(dtype=np.float64)
+    positions = np.arange(0, len(df), 997)
+    for rows in _selections(len(df)):
+        if rows is not None and len(rows) == 0:
+            continue
+        selected = values if rows is None else values[rows]
+        expected = [(selected <= values[p]).sum() / len(selected) * 100 for p in positions]
+        np.testing.assert_allclose(index.percentile(rows, column, positions), expected)
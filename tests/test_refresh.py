@@ -0,0 +1,20 @@
+import os
+
+from kpi.data import generate_data
+from kpi.refresh import Refresher
+from kpi.sources import open_source
+from kpi.store import DatasetStore
+
+
+def test_superseded_store_versions_are_removed(tmp_path):
+    exports, root = tmp_path / "exports", tmp_path / "store"
+    exports.mkdir()
+    df = generate_data(500)[0]
+    df.to_csv(exports / "Sales_2024-01.csv", index=False)
+    refresher = Refresher(open_source(str(exports), workers=1), store=DatasetStore(str(root)), interval=0).start()
+    first = refresher.current.digest
+
+    df.to_csv(exports / "Sales_2024-02.csv", index=False)
+    assert refresher.check()
+    assert os.listdir(root) == [refresher.current.digest]
+    assert refresher.current.digest != first
@@ -0,0 +1,25 @@
+import pandas as pd
+
+from kpi.data import generate_data, project_summary
+from kpi.rollups import ProjectRollup
+from kpi.schema import to_compact
+
+
+def test_blank_secondary_project_counts_as_none():
+    df = generate_data(1000)[0]
+    blank = df.copy()
+    blank["Secondary_Project"] = blank["Secondary_Project"].astype("string")
+    blank.loc[[3, 10, 50, 77, 200, 500], "Secondary_Project"] = pd.NA
+    filled = df.copy()
+    filled.loc[[3, 10, 50, 77, 200, 500], "Secondary_Project"] = "—"
+
+    expected = project_summary(filled)
+    pd.testing.assert_frame_equal(project_summary(blank), expected)
+    pd.testing.assert_frame_equal(project_summary(to_compact(blank)), expected)
+
+
+def test_merged_partial_sums_match_a_full_rollup():
+    df = generate_data(5000)[0]
+    parts = [ProjectRollup(df.iloc[:2000]).sums, ProjectRollup(df.iloc[2000:]).sums]
+    merged = ProjectRollup.merge_summary(parts).sort_values("Project", ignore_index=True)
+    pd.testing.assert_frame_equal(merged, project_summary(df).sort_values("Project", ignore_index=True))
@@ -0,0 +1,13 @@
+import numpy as np
+
+from kpi.data import generate_data
+from kpi.schema import to_compact
+
+
+def test_large_task_counts_widen_instead_of_wrapping():
+    df = generate_data(100)[0]
+    df.loc[7, "Tasks_Assigned"] = 40_000
+    out = to_compact(df)
+    assert out["Tasks_Assigned"].dtype == np.int32
+    assert out.loc[7, "Tasks_Assigned"] == 40_000
+    assert out["Tasks_Overdue"].dtype == np.int16
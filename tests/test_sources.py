@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+from kpi.data import generate_data
+from kpi.schema import concat_compact
+from kpi.sources import DirectorySource, _worker_context, open_source
+
+
+@pytest.fixture
+def blank_export(tmp_path):
+    # An HR export where a few employees have no secondary project filled in
+    df = generate_data(1000)[0]
+    df.loc[[3, 10, 50, 77, 200, 500], "Secondary_Project"] = None
+    path = tmp_path / "employees.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_blank_secondary_project_reads_as_no_project(blank_export, compact):
+    df = open_source(blank_export).load_rows(compact)
+    assert df["Secondary_Project"].notna().all()
+    assert df.loc[[3, 10, 50, 77, 200, 500], "Secondary_Project"].eq("—").all()
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_load_rows_matches_pandas_concat(blank_export, compact):
+    source = open_source(blank_export, chunksize=300)
+    chunks = list(source.iter_chunks(compact))
+    expected = concat_compact(chunks) if compact else pd.concat(chunks, ignore_index=True)
+    pd.testing.assert_frame_equal(source.load_rows(compact), expected)
+
+
+def _write_months(root, df, months):
+    for month in months:
+        for dept, rows in df.groupby("Department"):
+            rows.to_csv(root / f"{dept}_{month}.csv", index=False)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_directory_reload_reuses_unchanged_exports(tmp_path, compact):
+    df = generate_data(2000)[0]
+    # Identical files for both months must still give one trend row per month
+    _write_months(tmp_path, df, ["2024-01", "2024-02"])
+    source = DirectorySource(str(tmp_path), workers=1)
+    source.load(compact)
+
+    sales = df[df["Department"] == "Sales"].assign(Quality_Score=50.0)
+    sales.to_csv(tmp_path / "Sales_2024-02.csv", index=False)
+    df[df["Department"] == "HR"].to_csv(tmp_path / "HR_2024-03.csv", index=False)
+    reloaded = source.load(compact)
+
+    assert source.reparsed == 2
+    expected = DirectorySource(str(tmp_path), workers=1).load(compact)
+    for got, want in zip(reloaded, expected):
+        pd.testing.assert_frame_equal(got, want)
+    assert reloaded[1]["Month"].nunique() == 3
+
+
+def test_workers_fall_back_to_spawn_without_forkserver(monkeypatch):
+    monkeypatch.setattr("multiprocessing.get_all_start_methods", lambda: ["spawn"])
+    assert _worker_context().get_start_method() == "spawn"
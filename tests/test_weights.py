@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from kpi.data import generate_data
+from kpi.schema import to_compact
+from kpi.sources import open_source
+from kpi.weights import DEFAULT_WEIGHTS, SCORE_COLUMNS, WeightEngine
+
+
+EQUAL_WEIGHTS = dict.fromkeys(SCORE_COLUMNS, 1.0)
+
+
+@pytest.fixture(params=[False, True], ids=["default", "compact"])
+def employees(request):
+    df = generate_data(5000)[0]
+    return to_compact(df) if request.param else df
+
+
+def test_default_weights_return_the_stored_kpi(employees):
+    engine = WeightEngine(employees)
+    np.testing.assert_array_equal(engine.score(DEFAULT_WEIGHTS),
+                                  employees["Overall_KPI"].to_numpy(dtype=np.float32))
+    rows = np.arange(0, len(employees), 7)
+    np.testing.assert_array_equal(engine.score(DEFAULT_WEIGHTS, rows),
+                                  employees["Overall_KPI"].to_numpy(dtype=np.float32)[rows])
+
+
+def test_equal_weights_match_the_row_mean(employees):
+    engine = WeightEngine(employees)
+    expected = employees[SCORE_COLUMNS].astype(float).mean(axis=1).round(1).to_numpy()
+    # float32 scoring may round a .x5 the other way
+    np.testing.assert_allclose(engine.score(EQUAL_WEIGHTS), expected, atol=0.1 + 1e-4)
+    rows = np.arange(3, len(employees), 11)
+    np.testing.assert_allclose(engine.score(EQUAL_WEIGHTS, rows), expected[rows], atol=0.1 + 1e-4)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_blank_department_and_initiative_cells(tmp_path, compact):
+    df = generate_data(1000)[0]
+    df.loc[[5, 9], "Department"] = None
+    df.loc[[1, 2, 3], "Initiative"] = None
+    df.to_csv(tmp_path / "employees.csv", index=False)
+    df = open_source(str(tmp_path / "employees.csv")).load_rows(compact)
+
+    engine = WeightEngine(df)
+    expected = df[SCORE_COLUMNS].astype(float).mean(axis=1).round(1).to_numpy()
+    np.testing.assert_allclose(engine.score(EQUAL_WEIGHTS), expected, atol=0.1 + 1e-4)
+
+    summary = engine.summary("all", weights=EQUAL_WEIGHTS)
+    departments = summary["departments"]
+    assert departments["Employees"].sum() == len(df) - 2
+    assert departments["Department"].notna().all()